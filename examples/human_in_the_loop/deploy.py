@@ -1,29 +1,77 @@
-from fastapi import FastAPI, HTTPException
-from typing import Optional
-from pydantic import BaseModel
+from collections import OrderedDict
+import hashlib
+import json
+from fastapi import Body, FastAPI, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import List, Optional
 
 # Import our workflow components
-from grapheteria import WorkflowEngine
+from grapheteria import WorkflowEngine, WorkflowStatus
 # Do not forget to import your nodes since we are utilizing the JSON schema!
 import nodes
+
+
+class NonStreamingGZipMiddleware(GZipMiddleware):
+    """Gzip responses except the SSE stream, which would otherwise be buffered
+    by Starlette releases that don't exempt text/event-stream"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/workflows/stream/"):
+            await self.app(scope, receive, send)
+        else:
+            await super().__call__(scope, receive, send)
+
+
 # Create FastAPI app
-app = FastAPI(title="AI Content Creation API")
+# orjson serializes the shared-state payloads much faster than the stdlib encoder
+app = FastAPI(title="AI Content Creation API", default_response_class=ORJSONResponse)
+# shared_state carries whole message histories and tool schemas; compress the larger bodies
+app.add_middleware(NonStreamingGZipMiddleware, minimum_size=1024, compresslevel=5)
 
-# Store for active workflows
-active_workflows = {}
+# Live engines, most recently used last. Every step is already persisted by the
+# engine's storage backend, so evicted or restarted runs are rebuilt from there.
+MAX_LIVE_WORKFLOWS = 512
+active_workflows: "OrderedDict[str, WorkflowEngine]" = OrderedDict()
 
-# Models for request validation
-class InputData(BaseModel):
-    input_value: str
+def remember_workflow(workflow: WorkflowEngine) -> None:
+    """Keep a workflow resident, evicting the least recently used one if full"""
+    active_workflows[workflow.run_id] = workflow
+    active_workflows.move_to_end(workflow.run_id)
+    while len(active_workflows) > MAX_LIVE_WORKFLOWS:
+        _, evicted = active_workflows.popitem(last=False)
+        # A run paused for input holds a task awaiting its answer; the
+        # rebuilt engine re-runs that node with the input instead
+        if evicted._current_execute_task:
+            evicted._current_execute_task.cancel()
+
+def get_workflow(run_id: str) -> WorkflowEngine:
+    """Return the live workflow for run_id, rehydrating it from its saved steps"""
+    workflow = active_workflows.get(run_id)
+    if workflow is not None:
+        active_workflows.move_to_end(run_id)
+        return workflow
+    try:
+        workflow = WorkflowEngine(workflow_path="workflow.json", run_id=run_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    remember_workflow(workflow)
+    return workflow
+
+def release_if_finished(workflow: WorkflowEngine) -> None:
+    """Drop a finished run from memory; later reads rebuild it from its saved steps"""
+    if workflow.execution_state.workflow_status in (WorkflowStatus.COMPLETED, WorkflowStatus.FAILED):
+        active_workflows.pop(workflow.run_id, None)
 
 # Routes for workflow interaction
-@app.post("/workflows/create")
+@app.post("/workflows/create", response_model=None)
 async def create_workflow():
     """Create a new content creation workflow instance"""
     try:
         workflow = WorkflowEngine(workflow_path="workflow.json")
         run_id = workflow.run_id
-        active_workflows[run_id] = workflow
+        remember_workflow(workflow)
         
         return {
             "message": "Content workflow created",
@@ -33,19 +81,19 @@ async def create_workflow():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create workflow: {str(e)}")
 
-@app.post("/workflows/run/{run_id}")
-async def step_workflow(run_id: str, input_data: Optional[InputData] = None):
+@app.post("/workflows/run/{run_id}", response_model=None)
+async def step_workflow(
+    run_id: str,
+    input_value: Optional[str] = Body(None, embed=True),
+    fields: List[str] = Query([]),
+):
     """Execute one step of the workflow - used when input is needed"""
-    if run_id not in active_workflows:
-        raise HTTPException(status_code=404, detail="Workflow not found")
-    
-    workflow = active_workflows[run_id]
+    workflow = get_workflow(run_id)
     
     try:
         # If the workflow is waiting for input and we provided input
-        if workflow.execution_state.awaiting_input and input_data:
+        if workflow.execution_state.awaiting_input and input_value is not None:
             node_id = workflow.execution_state.awaiting_input["node_id"]
-            input_value = input_data.input_value
             
             # Step with provided input
             await workflow.run({node_id: input_value})
@@ -53,27 +101,70 @@ async def step_workflow(run_id: str, input_data: Optional[InputData] = None):
             # Step without input
             await workflow.run()
         
-        # Prepare response
-        response = {
-            "status": workflow.execution_state.workflow_status,
-            "article": workflow.execution_state.shared.get("content")
-        }
-        
-        # If workflow is waiting for input, include that info
-        if workflow.execution_state.awaiting_input:
-            response["awaiting_input"] = workflow.execution_state.awaiting_input
-            
-        return response
+        release_if_finished(workflow)
+        return step_response(workflow, fields)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Step failed: {str(e)}")
 
-@app.get("/workflows/status/{run_id}")
-async def get_workflow_status(run_id: str):
-    """Check the current status of a workflow"""
-    if run_id not in active_workflows:
-        raise HTTPException(status_code=404, detail="Workflow not found")
+def step_response(workflow: WorkflowEngine, fields: List[str]) -> dict:
+    """Summarize the workflow after a step for API clients"""
+    response = {
+        "status": workflow.execution_state.workflow_status,
+    }
+
+    # The article can be long, so it is only sent to clients that ask for it
+    if "article" in fields:
+        response["article"] = workflow.execution_state.shared.get("article")
     
-    workflow = active_workflows[run_id]
+    # If workflow is waiting for input, include that info
+    if workflow.execution_state.awaiting_input:
+        response["awaiting_input"] = workflow.execution_state.awaiting_input
+        
+    return response
+
+@app.post("/workflows/stream/{run_id}", response_model=None)
+async def stream_workflow(
+    run_id: str,
+    input_value: Optional[str] = Body(None, embed=True),
+    fields: List[str] = Query([]),
+):
+    """Run the workflow like /workflows/run, streaming an SSE event after every step"""
+    workflow = get_workflow(run_id)
+
+    async def events():
+        try:
+            if workflow.execution_state.awaiting_input and input_value is not None:
+                request_key = workflow.execution_state.awaiting_input["node_id"]
+                await workflow.step({request_key: input_value})
+                yield _sse(step_response(workflow, fields))
+
+            while await workflow.step():
+                yield _sse(step_response(workflow, fields))
+            yield _sse(step_response(workflow, fields))
+            release_if_finished(workflow)
+        except Exception as e:
+            yield _sse({"error": f"Step failed: {str(e)}"})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+def _sse(payload: dict) -> str:
+    return f"data: {json.dumps(jsonable_encoder(payload))}\n\n"
+
+def not_modified(workflow: WorkflowEngine, request: Request, response: Response) -> bool:
+    """Tag the response with the workflow's revision; True if the client already has it"""
+    # Every step is saved, so the step counter moves whenever the state does
+    state = workflow.execution_state
+    revision = (workflow.run_id, workflow.current_step, state.workflow_status, state.next_node_id)
+    etag = '"%s"' % hashlib.blake2b(repr(revision).encode(), digest_size=12).hexdigest()
+    response.headers["ETag"] = etag
+    return request.headers.get("if-none-match") == etag
+
+@app.get("/workflows/status/{run_id}", response_model=None)
+async def get_workflow_status(run_id: str, request: Request, response: Response):
+    """Check the current status of a workflow"""
+    workflow = get_workflow(run_id)
+    if not_modified(workflow, request, response):
+        return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
     
     # Extract the important information
     return {
@@ -86,4 +177,5 @@ async def get_workflow_status(run_id: str):
 # Run the server
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # loop/http "auto" pick uvloop and httptools when installed (uvicorn[standard])
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="auto", http="auto")
\ No newline at end of file
@@ -1,7 +1,13 @@
-from nodes import *
+from nodes import GenerateContentNode, HumanReviewNode, PublishNode, ReviseNode
 from grapheteria import WorkflowEngine
 import asyncio
 
+try:
+    # Faster event loop where available; uvloop doesn't support Windows
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Create nodes
 generate = GenerateContentNode(id="generate_content")
 review = HumanReviewNode(id="human_review")
@@ -50,4 +56,7 @@ async def run_workflow():
             
 if __name__ == "__main__":
     # Run the workflow
-    asyncio.run(run_workflow())
+    if uvloop is not None:
+        uvloop.run(run_workflow())
+    else:
+        asyncio.run(run_workflow())
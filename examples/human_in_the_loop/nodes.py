@@ -10,9 +10,9 @@ class GenerateContentNode(Node):
         shared["topic"] = topic 
         return topic
 
-    def execute(self, topic):
+    async def execute(self, topic):
         prompt = f"Write an informative article about {topic}"
-        article = call_llm(prompt)
+        article = await call_llm(prompt)
         return article
 
     def cleanup(self, shared, prep_result, exec_result):
@@ -53,7 +53,7 @@ class ReviseNode(Node):
 
     async def execute(self, data):           
         new_prompt = f"Topic: {data['topic']}. Revise this article: {data['content'][:200]}... Based on feedback: {data['feedback']}"
-        revised = call_llm(new_prompt, max_tokens=700)
+        revised = await call_llm(new_prompt, max_tokens=700)
         return revised
 
     def cleanup(self, shared, prep_result, exec_result):
@@ -1,6 +1,6 @@
 from functools import lru_cache
 import os
-from openai import OpenAI
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -8,14 +8,14 @@ load_dotenv()
 
 @lru_cache(maxsize=1)
 def get_llm_client():
-    return OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    return AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
 
-def call_llm(prompt, max_tokens=500):
+async def call_llm(prompt, max_tokens=500):
     """Call OpenAI's API to generate text."""
     llm_client = get_llm_client()
-    
+
     try:
-        response = llm_client.chat.completions.create(
+        response = await llm_client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "You are a helpful article writer."},
@@ -28,4 +28,3 @@ def call_llm(prompt, max_tokens=500):
     except Exception as e:
         print(f"Error calling OpenAI API: {e}")
         return f"Failed to generate article about {prompt}"
-
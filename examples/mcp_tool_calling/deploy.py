@@ -1,28 +1,79 @@
-from fastapi import FastAPI, HTTPException
+from collections import OrderedDict
+import hashlib
+import json
+from fastapi import Body, FastAPI, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import Optional
-from pydantic import BaseModel
 
 # Import our workflow components
-from grapheteria import WorkflowEngine
+from grapheteria import WorkflowEngine, WorkflowStatus
 # Import nodes to ensure they're registered
 import nodes
 
-app = FastAPI(title="MCP Tool-Calling API")
 
-# Store for active workflows
-active_workflows = {}
+class NonStreamingGZipMiddleware(GZipMiddleware):
+    """Gzip responses except the SSE stream, which would otherwise be buffered
+    by Starlette releases that don't exempt text/event-stream"""
 
-# Models for request validation
-class InputData(BaseModel):
-    input_value: str
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/workflows/stream/"):
+            await self.app(scope, receive, send)
+        else:
+            await super().__call__(scope, receive, send)
+
+
+# orjson serializes the shared-state payloads much faster than the stdlib encoder
+app = FastAPI(title="MCP Tool-Calling API", default_response_class=ORJSONResponse)
+# shared_state carries whole message histories and tool schemas; compress the larger bodies
+app.add_middleware(NonStreamingGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+@app.on_event("shutdown")
+async def close_mcp_sessions():
+    await nodes.MCP_POOL.close()
+
+# Live engines, most recently used last. Every step is already persisted by the
+# engine's storage backend, so evicted or restarted runs are rebuilt from there.
+MAX_LIVE_WORKFLOWS = 512
+active_workflows: "OrderedDict[str, WorkflowEngine]" = OrderedDict()
+
+def remember_workflow(workflow: WorkflowEngine) -> None:
+    """Keep a workflow resident, evicting the least recently used one if full"""
+    active_workflows[workflow.run_id] = workflow
+    active_workflows.move_to_end(workflow.run_id)
+    while len(active_workflows) > MAX_LIVE_WORKFLOWS:
+        _, evicted = active_workflows.popitem(last=False)
+        # A run paused for input holds a task awaiting its answer; the
+        # rebuilt engine re-runs that node with the input instead
+        if evicted._current_execute_task:
+            evicted._current_execute_task.cancel()
+
+def get_workflow(run_id: str) -> WorkflowEngine:
+    """Return the live workflow for run_id, rehydrating it from its saved steps"""
+    workflow = active_workflows.get(run_id)
+    if workflow is not None:
+        active_workflows.move_to_end(run_id)
+        return workflow
+    try:
+        workflow = WorkflowEngine(workflow_path="workflow.json", run_id=run_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    remember_workflow(workflow)
+    return workflow
 
-@app.post("/workflows/create")
+def release_if_finished(workflow: WorkflowEngine) -> None:
+    """Drop a finished run from memory; later reads rebuild it from its saved steps"""
+    if workflow.execution_state.workflow_status in (WorkflowStatus.COMPLETED, WorkflowStatus.FAILED):
+        active_workflows.pop(workflow.run_id, None)
+
+@app.post("/workflows/create", response_model=None)
 async def create_workflow():
     """Create a new tool-calling workflow instance"""
     try:
         workflow = WorkflowEngine(workflow_path="workflow.json")
         run_id = workflow.run_id
-        active_workflows[run_id] = workflow
+        remember_workflow(workflow)
         
         return {
             "message": "MCP Tool-calling workflow created",
@@ -32,57 +83,89 @@ async def create_workflow():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create workflow: {str(e)}")
 
-@app.post("/workflows/run/{run_id}")
-async def step_workflow(run_id: str, input_data: Optional[InputData] = None):
+@app.post("/workflows/run/{run_id}", response_model=None)
+async def step_workflow(run_id: str, input_value: Optional[str] = Body(None, embed=True)):
     """Execute one step of the workflow - handles inputs when needed"""
-    if run_id not in active_workflows:
-        raise HTTPException(status_code=404, detail="Workflow not found")
-    
-    workflow = active_workflows[run_id]
+    workflow = get_workflow(run_id)
     
     try:
         # If workflow is waiting for input and we have input
-        if workflow.execution_state.awaiting_input and input_data:
+        if workflow.execution_state.awaiting_input and input_value is not None:
             node_id = workflow.execution_state.awaiting_input["request_id"]
-            input_value = input_data.input_value
 
             await workflow.run({node_id: input_value})
         else:
             # Step without input
             await workflow.run()
         
-        # Prepare the response
-        response = {
-            "status": workflow.execution_state.workflow_status.name,
-        }
-        
-        # Include final response if available
-        if "final_response" in workflow.execution_state.shared:
-            response["answer"] = workflow.execution_state.shared["final_response"]
-        
-        # Include question if available
-        if "question" in workflow.execution_state.shared:
-            response["question"] = workflow.execution_state.shared["question"]
-        
-        # Include tool call information if available
-        if "tool_calls" in workflow.execution_state.shared:
-            response["tool_calls"] = workflow.execution_state.shared["tool_calls"]
-        
-        # Include input request if waiting for input
-        if workflow.execution_state.awaiting_input:
-            response["awaiting_input"] = workflow.execution_state.awaiting_input
-            
-        return response
+        release_if_finished(workflow)
+        return step_response(workflow)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Workflow step failed: {str(e)}")
 
-@app.get("/workflows/status/{run_id}")
-async def get_workflow_status(run_id: str):
-    """Check the current status of a workflow"""
-    if run_id not in active_workflows:
-        raise HTTPException(status_code=404, detail="Workflow not found")
+def step_response(workflow: WorkflowEngine) -> dict:
+    """Summarize the workflow after a step for API clients"""
+    response = {
+        "status": workflow.execution_state.workflow_status.name,
+    }
+    
+    # Include final response if available
+    if "final_response" in workflow.execution_state.shared:
+        response["answer"] = workflow.execution_state.shared["final_response"]
+    
+    # Include question if available
+    if "question" in workflow.execution_state.shared:
+        response["question"] = workflow.execution_state.shared["question"]
     
-    workflow = active_workflows[run_id]
+    # Include tool call information if available
+    if "tool_calls" in workflow.execution_state.shared:
+        response["tool_calls"] = workflow.execution_state.shared["tool_calls"]
+    
+    # Include input request if waiting for input
+    if workflow.execution_state.awaiting_input:
+        response["awaiting_input"] = workflow.execution_state.awaiting_input
+        
+    return response
+
+@app.post("/workflows/stream/{run_id}", response_model=None)
+async def stream_workflow(run_id: str, input_value: Optional[str] = Body(None, embed=True)):
+    """Run the workflow like /workflows/run, streaming an SSE event after every step"""
+    workflow = get_workflow(run_id)
+
+    async def events():
+        try:
+            if workflow.execution_state.awaiting_input and input_value is not None:
+                request_key = workflow.execution_state.awaiting_input["request_id"]
+                await workflow.step({request_key: input_value})
+                yield _sse(step_response(workflow))
+
+            while await workflow.step():
+                yield _sse(step_response(workflow))
+            yield _sse(step_response(workflow))
+            release_if_finished(workflow)
+        except Exception as e:
+            yield _sse({"error": f"Step failed: {str(e)}"})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+def _sse(payload: dict) -> str:
+    return f"data: {json.dumps(jsonable_encoder(payload))}\n\n"
+
+def not_modified(workflow: WorkflowEngine, request: Request, response: Response) -> bool:
+    """Tag the response with the workflow's revision; True if the client already has it"""
+    # Every step is saved, so the step counter moves whenever the state does
+    state = workflow.execution_state
+    revision = (workflow.run_id, workflow.current_step, state.workflow_status, state.next_node_id)
+    etag = '"%s"' % hashlib.blake2b(repr(revision).encode(), digest_size=12).hexdigest()
+    response.headers["ETag"] = etag
+    return request.headers.get("if-none-match") == etag
+
+@app.get("/workflows/status/{run_id}", response_model=None)
+async def get_workflow_status(run_id: str, request: Request, response: Response):
+    """Check the current status of a workflow"""
+    workflow = get_workflow(run_id)
+    if not_modified(workflow, request, response):
+        return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
     
      # Extract the important information
     return {
@@ -91,13 +174,12 @@ async def get_workflow_status(run_id: str):
         "awaiting_input": workflow.execution_state.awaiting_input
     }
 
-@app.get("/workflows/results/{run_id}")
-async def get_workflow_results(run_id: str):
+@app.get("/workflows/results/{run_id}", response_model=None)
+async def get_workflow_results(run_id: str, request: Request, response: Response):
     """Get the current results from the workflow"""
-    if run_id not in active_workflows:
-        raise HTTPException(status_code=404, detail="Workflow not found")
-    
-    workflow = active_workflows[run_id]
+    workflow = get_workflow(run_id)
+    if not_modified(workflow, request, response):
+        return Response(status_code=304, headers={"ETag": response.headers["ETag"]})
     shared = workflow.execution_state.shared
     
     # Extract the important information
@@ -115,16 +197,19 @@ async def get_workflow_results(run_id: str):
     
     return result
 
-@app.delete("/workflows/{run_id}")
+@app.delete("/workflows/{run_id}", response_model=None)
 async def delete_workflow(run_id: str):
     """Delete a workflow instance"""
-    if run_id not in active_workflows:
+    # Only the live instance is dropped; its saved steps stay in the logs
+    workflow = active_workflows.pop(run_id, None)
+    if workflow is None:
         raise HTTPException(status_code=404, detail="Workflow not found")
-    
-    del active_workflows[run_id]
+    if workflow._current_execute_task:
+        workflow._current_execute_task.cancel()
     return {"message": f"Workflow {run_id} deleted successfully"}
 
 # Run the server
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # loop/http "auto" pick uvloop and httptools when installed (uvicorn[standard])
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="auto", http="auto")
@@ -1,8 +1,17 @@
 # main.py
-from nodes import *
+from nodes import (
+    MCP_POOL, QuestionNode, CollectMCPToolsNode, InitialResponseNode,
+    ToolExecutionNode, FinalResponseNode, FeedbackNode,
+)
 from grapheteria import WorkflowEngine
 import asyncio
 
+try:
+    # Faster event loop where available; uvloop doesn't support Windows
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Create nodes
 question = QuestionNode(id="question")
 collect_mcp_tools = CollectMCPToolsNode(id="collect_mcp_tools")
@@ -50,6 +59,8 @@ async def run_workflow():
             await workflow.step({request_id: user_input})
         elif not continue_workflow:
             break
+
+    await MCP_POOL.close()
             
 if __name__ == "__main__":
     print("🧠 Claude Research Assistant with MCP Tools")
@@ -57,4 +68,7 @@ if __name__ == "__main__":
     print("Ask me anything! I can use tools to help you.")
     
     # Run the workflow
-    asyncio.run(run_workflow())
+    if uvloop is not None:
+        uvloop.run(run_workflow())
+    else:
+        asyncio.run(run_workflow())
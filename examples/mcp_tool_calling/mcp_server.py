@@ -1,43 +1,102 @@
 # mcp_server.py
+import ast
+import operator
+from functools import lru_cache
 from fastmcp import FastMCP
 
 # Create a named server
 mcp = FastMCP("Research Assistant Server")
 
+# Only plain arithmetic and these functions are allowed in calculate()
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+_FUNCTIONS = {"abs": abs, "round": round, "max": max, "min": min}
+# Integer powers are exact and can get arbitrarily large; bound the result
+# size itself so nested powers like (9**99)**99 are refused before computing
+_MAX_POW_BITS = 4096
+
+@lru_cache(maxsize=1024)
+def _parse(expression: str) -> ast.expr:
+    return ast.parse(expression, mode="eval").body
+
+def _evaluate(node: ast.expr) -> float:
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        left, right = _evaluate(node.left), _evaluate(node.right)
+        if (
+            isinstance(node.op, ast.Pow)
+            and isinstance(left, int)
+            and isinstance(right, int)
+            and left.bit_length() * right > _MAX_POW_BITS
+        ):
+            raise ValueError("Result too large")
+        return _BIN_OPS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_evaluate(node.operand))
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in _FUNCTIONS
+        and not node.keywords
+    ):
+        return _FUNCTIONS[node.func.id](*(_evaluate(arg) for arg in node.args))
+    raise ValueError(f"Unsupported expression: {ast.dump(node)}")
+
 @mcp.tool()
 def calculate(expression: str) -> float:
     """Evaluate a mathematical expression safely"""
-    # In a real application, use a safer evaluation method
-    return eval(expression, {"__builtins__": {}}, {"abs": abs, "round": round, "max": max, "min": min})
+    return _evaluate(_parse(expression))
+
+_COUNTRIES = {
+    "france": {"capital": "Paris", "population": "67 million", "language": "French"},
+    "japan": {"capital": "Tokyo", "population": "126 million", "language": "Japanese"},
+    "brazil": {"capital": "Brasília", "population": "213 million", "language": "Portuguese"},
+}
+_COUNTRY_NOT_FOUND = {"error": "Country not found"}
 
 @mcp.tool()
 def get_country_info(country: str) -> dict:
     """Get basic information about a country"""
-    countries = {
-        "france": {"capital": "Paris", "population": "67 million", "language": "French"},
-        "japan": {"capital": "Tokyo", "population": "126 million", "language": "Japanese"},
-        "brazil": {"capital": "Brasília", "population": "213 million", "language": "Portuguese"},
-    }
-    return countries.get(country.lower(), {"error": "Country not found"})
+    return _COUNTRIES.get(country.lower(), _COUNTRY_NOT_FOUND)
+
+def _celsius_to_fahrenheit(value: float) -> float:
+    return value * 9/5 + 32
+
+def _fahrenheit_to_celsius(value: float) -> float:
+    return (value - 32) * 5/9
+
+# (from_unit, to_unit) -> multiplication factor
+_CONVERSION_FACTORS = {
+    ("km", "miles"): 0.621371,
+    ("miles", "km"): 1.60934,
+    ("kg", "lb"): 2.20462,
+    ("lb", "kg"): 0.453592,
+}
+# (from_unit, to_unit) -> conversion function, for non-linear units
+_CONVERSION_FUNCTIONS = {
+    ("celsius", "fahrenheit"): _celsius_to_fahrenheit,
+    ("fahrenheit", "celsius"): _fahrenheit_to_celsius,
+}
 
 @mcp.tool()
 def convert_units(value: float, from_unit: str, to_unit: str) -> float:
     """Convert between common units"""
-    conversions = {
-        "km_to_miles": 0.621371,
-        "miles_to_km": 1.60934,
-        "kg_to_lb": 2.20462,
-        "lb_to_kg": 0.453592,
-        "celsius_to_fahrenheit": lambda x: x * 9/5 + 32,
-        "fahrenheit_to_celsius": lambda x: (x - 32) * 5/9,
-    }
-    
-    key = f"{from_unit.lower()}_to_{to_unit.lower()}"
-    if key in conversions:
-        converter = conversions[key]
-        if callable(converter):
-            return converter(value)
-        return value * converter
+    key = (from_unit.lower(), to_unit.lower())
+    factor = _CONVERSION_FACTORS.get(key)
+    if factor is not None:
+        return value * factor
+    converter = _CONVERSION_FUNCTIONS.get(key)
+    if converter is not None:
+        return converter(value)
     return {"error": "Conversion not supported"}
 
 # Start the server
@@ -1,9 +1,103 @@
 # nodes.py
 import asyncio
+import os
 from mcp import ClientSession, StdioServerParameters, stdio_client
 from utils import call_llm
 from grapheteria import Node
 
+SERVER_PARAMS = StdioServerParameters(
+    command="python",
+    args=["examples/mcp_tool_calling/mcp_server.py"],
+)
+# Tool schemas from the last list_tools call, valid while the server file is unchanged
+_TOOLS_CACHE = {"mtime": None, "tools": None}
+
+
+class MCPSessionPool:
+    """Initialized MCP sessions shared across nodes and workflow runs.
+
+    Servers are spawned lazily, up to `size` of them, so that many tool calls
+    run in parallel across sessions. Each session is owned by its own task,
+    since the stdio transport has to be closed from the task that opened it.
+    """
+
+    def __init__(self, server_params, size=4):
+        self.server_params = server_params
+        self.size = size
+        self._slots = None  # one per open or spawnable session
+        self._idle = []
+        self._owners = {}  # session -> (owner task, close event)
+
+    async def acquire(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        await self._slots.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            return await self._spawn()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, session):
+        """Hand a healthy session back for reuse"""
+        if session in self._owners:
+            self._idle.append(session)
+            self._slots.release()
+
+    def discard(self, session):
+        """Shut down a session that failed mid-call instead of reusing it"""
+        owner = self._owners.pop(session, None)
+        if owner is not None:
+            owner[1].set()
+            # Frees the slot so a waiting call spawns a replacement
+            self._slots.release()
+
+    async def close(self):
+        owners = list(self._owners.values())
+        self._owners.clear()
+        self._idle = []
+        self._slots = None
+        for _, closed in owners:
+            closed.set()
+        await asyncio.gather(*(task for task, _ in owners), return_exceptions=True)
+
+    async def _spawn(self):
+        ready = asyncio.get_event_loop().create_future()
+        closed = asyncio.Event()
+
+        async def own():
+            try:
+                async with stdio_client(self.server_params) as (read, write):
+                    async with ClientSession(read, write) as session:
+                        await session.initialize()
+                        ready.set_result(session)
+                        await closed.wait()
+            except Exception as e:
+                if not ready.done():
+                    ready.set_exception(e)
+
+        task = asyncio.ensure_future(own())
+        session = await ready
+        self._owners[session] = (task, closed)
+        return session
+
+
+MCP_POOL = MCPSessionPool(SERVER_PARAMS)
+
+
+async def call_mcp(method, *args):
+    """Run one ClientSession method on a pooled session"""
+    session = await MCP_POOL.acquire()
+    try:
+        result = await getattr(session, method)(*args)
+    except BaseException:
+        MCP_POOL.discard(session)
+        raise
+    MCP_POOL.release(session)
+    return result
+
 class QuestionNode(Node):
     async def prepare(self, shared, request_input):
         question = await request_input(
@@ -12,31 +106,25 @@ class QuestionNode(Node):
         )
 
         shared["question"] = question
-        shared["messages"] = shared.get("messages", [])
-        shared["messages"].append({
+        shared.setdefault("messages", []).append({
             "role": "user",
             "content": question
         })
 
 class CollectMCPToolsNode(Node):
     async def prepare(self, shared, _):
-        server_params = StdioServerParameters(
-        command="python",
-        args=["examples/mcp_tool_calling/mcp_server.py"],
-        )
+        mtime = os.path.getmtime(SERVER_PARAMS.args[0])
+        if _TOOLS_CACHE["mtime"] != mtime:
+            response = await call_mcp("list_tools")
 
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                # Initialize the connection
-                await session.initialize()
-                # Get tools
-                response = await session.list_tools()
-        
-        shared["tools"] = [{
-                    "name": tool.name,
-                    "description": tool.description,
-                    "input_schema": tool.inputSchema
-                } for tool in response.tools]  
+            _TOOLS_CACHE["tools"] = [{
+                        "name": tool.name,
+                        "description": tool.description,
+                        "input_schema": tool.inputSchema
+                    } for tool in response.tools]
+            _TOOLS_CACHE["mtime"] = mtime
+
+        shared["tools"] = list(_TOOLS_CACHE["tools"])
         shared["collected_tools"] = True
         
 class InitialResponseNode(Node):
@@ -48,7 +136,7 @@ class InitialResponseNode(Node):
     async def execute(self, prep_result):             
         tools, messages = prep_result
               
-        response = call_llm(messages, tools)
+        response = await call_llm(messages, tools)
     
         return response
     
@@ -64,12 +152,10 @@ class InitialResponseNode(Node):
                 tool_calls.append(tool_call)
 
         shared["tool_calls"] = tool_calls
-        messages = shared["messages"]
-        messages.append({
+        shared["messages"].append({
             "role": "assistant",
             "content": exec_result.content
         })
-        shared["messages"] = messages
 
 #Parallel Tool Execution
 class ToolExecutionNode(Node):
@@ -78,50 +164,39 @@ class ToolExecutionNode(Node):
         return tool_calls
     
     async def _execute_with_retry(self, items):
-        # Process all items in parallel
+        # Process all items in parallel; the session pool bounds how many run at once
         tasks = [self._process_item(item) for item in items]
         results = await asyncio.gather(*tasks, return_exceptions=True)
-        
+
         # Check for exceptions
         for result in results:
             if isinstance(result, Exception):
                 raise result
-                
+
         return results
 
     async def execute(self, prep_result):
         tool_id, tool_name, tool_input = prep_result['id'], prep_result['name'], prep_result['input']
 
-        server_params = StdioServerParameters(
-        command="python",
-        args=["examples/mcp_tool_calling/mcp_server.py"],
-        )
-
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                # Initialize the connection
-                await session.initialize()
-                # Execute the tool
-                result = await session.call_tool(tool_name, tool_input)
+        # Execute the tool
+        result = await call_mcp("call_tool", tool_name, tool_input)
 
-        
         return {
             "tool_use_id": tool_id,
             "result": result.content
         }
     
     def cleanup(self, shared, prep_result, exec_result):
-        for result in exec_result:
-            shared["messages"].append({
-                "role": "user",
-                "content": [
-                    {
-                        "type": "tool_result",
-                        "tool_use_id": result["tool_use_id"],
-                        "content": result["result"]
-                    }
-                ]
-            })
+        shared["messages"].extend({
+            "role": "user",
+            "content": [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": result["tool_use_id"],
+                    "content": result["result"]
+                }
+            ]
+        } for result in exec_result)
 
 class FinalResponseNode(Node):
     async def prepare(self, shared, request_input):
@@ -133,7 +208,7 @@ class FinalResponseNode(Node):
     async def execute(self, prep_result): 
         messages, tools = prep_result
         # Get final response from Claude
-        response = call_llm(messages, tools)
+        response = await call_llm(messages, tools)
         return response.content[0].text
     
     def cleanup(self, shared, prep_result, exec_result):
@@ -1,7 +1,7 @@
 # utils.py
 from functools import lru_cache
 from typing import Dict, Any, List
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 from dotenv import load_dotenv
 import os
 
@@ -9,11 +9,15 @@ load_dotenv()  # load environment variables from .env
 
 @lru_cache(maxsize=1)
 def get_llm_client():
-    return Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    return AsyncAnthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
 
-def call_llm(messages: List[Dict[str, Any]], tools: List[Dict[str, Any]]) -> str:
+async def call_llm(messages: List[Dict[str, Any]], tools: List[Dict[str, Any]]) -> str:
     llm_client = get_llm_client()
-    response = llm_client.messages.create(
+    if tools:
+        # The tool schemas are the same on every turn; mark the end of that
+        # prefix so the API serves it from its prompt cache
+        tools = [*tools[:-1], {**tools[-1], "cache_control": {"type": "ephemeral"}}]
+    response = await llm_client.messages.create(
             model="claude-3-5-sonnet-20241022",
             max_tokens=1000,
             messages=messages,
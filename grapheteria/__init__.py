@@ -3,16 +3,87 @@ from typing import Callable, Dict, Any, Optional, List, Type
 from enum import Enum, auto
 from datetime import datetime
 import copy
-import json
+import orjson
 import asyncio
 from abc import ABC
+from collections import OrderedDict
 import inspect
+import operator
 import os
+import ast
+import sys
 from uuid import uuid4
+from functools import lru_cache, partial
 from grapheteria.utils import StorageBackend, FileSystemStorage, path_to_id, id_to_path
 
 # At the top of machine.py, before the class definitions
 _NODE_REGISTRY: Dict[str, Type["Node"]] = {}
+# Keyed by "module.QualName" so same-named nodes in different modules don't collide
+_QUALIFIED_NODE_REGISTRY: Dict[str, Type["Node"]] = {}
+
+
+# Bumped on every registration so cached workflow graphs notice reloaded classes
+_registry_version = 0
+# (abs path, mtime_ns, registry version) -> (node specs, start node id, initial state),
+# least recently used first
+_WORKFLOW_CACHE_SIZE = 64
+_WORKFLOW_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+def _register_node(cls: Type["Node"]) -> bool:
+    """Record a concrete node class under its short and qualified names"""
+    # Whether a lifecycle method is async is fixed by the class definition
+    cls._prepare_is_async = inspect.iscoroutinefunction(cls.prepare)
+    cls._execute_is_async = inspect.iscoroutinefunction(cls.execute)
+    cls._cleanup_is_async = inspect.iscoroutinefunction(cls.cleanup)
+    cls._fallback_is_async = inspect.iscoroutinefunction(cls.exec_fallback)
+    if inspect.isabstract(cls):
+        return False
+    global _registry_version
+    _NODE_REGISTRY[cls.__name__] = cls
+    _QUALIFIED_NODE_REGISTRY[f"{cls.__module__}.{cls.__qualname__}"] = cls
+    _resolve_node_type.cache_clear()
+    _registry_version += 1
+    return True
+
+
+@lru_cache(maxsize=None)
+def _resolve_node_type(name: str) -> Optional[Type["Node"]]:
+    """Look up a node class by qualified name, falling back to the short name"""
+    return _QUALIFIED_NODE_REGISTRY.get(name) or _NODE_REGISTRY.get(name)
+
+_ATOMIC_TYPES = (str, int, float, bool, type(None))
+
+
+def _snapshot(value: Any, memo: Optional[dict] = None) -> Any:
+    """Copy plain dicts/lists directly and only hand other objects to deepcopy.
+
+    Like deepcopy, the memo maps id() of each copied container to its copy, so
+    repeated and self-referencing containers stay aliased in the snapshot.
+    """
+    value_type = type(value)
+    if value_type in _ATOMIC_TYPES:
+        return value
+    if memo is None:
+        memo = {}
+    elif id(value) in memo:
+        return memo[id(value)]
+    if value_type is dict:
+        copied = memo[id(value)] = {}
+        for k, v in value.items():
+            copied[k] = _snapshot(v, memo)
+        return copied
+    if value_type is list:
+        copied = memo[id(value)] = []
+        for v in value:
+            copied.append(_snapshot(v, memo))
+        return copied
+    return copy.deepcopy(value, memo)
+
+
+def _is_awaitable(value: Any) -> bool:
+    """inspect.isawaitable, skipping its ABC check for the None/plain values sync methods return"""
+    return type(value) not in _ATOMIC_TYPES and inspect.isawaitable(value)
 
 
 class WorkflowStatus(Enum):
@@ -32,7 +103,8 @@ class NodeStatus(str, Enum):
     FAILED = "failed"
 
 
-@dataclass
+# slots= is only accepted by dataclass from Python 3.10
+@dataclass(**({"slots": True} if sys.version_info >= (3, 10) else {}))
 class ExecutionState:
     """Represents the complete state of a workflow execution."""
 
@@ -45,22 +117,27 @@ class ExecutionState:
     metadata: Dict[str, Any] = field(default_factory=dict)  # Add metadata field
 
     def to_dict(self) -> dict:
-        result = {
-            "shared": self.shared,
+        # Only the mutable containers need copying to keep snapshots independent
+        return {
+            "shared": _snapshot(self.shared),
             "next_node_id": self.next_node_id,
             "workflow_status": self.workflow_status.name,
+            # Plain strings, so pickled logs don't reference the NodeStatus class
             "node_statuses": {k: v.value for k, v in self.node_statuses.items()},
-            "awaiting_input": self.awaiting_input,
+            "awaiting_input": _snapshot(self.awaiting_input),
             "previous_node_id": self.previous_node_id,
-            "metadata": self.metadata,
+            "metadata": _snapshot(self.metadata),
         }
-        # Return a deep copy to ensure independence from the original state
-        return copy.deepcopy(result)
 
     @classmethod
     def from_dict(cls, data: dict) -> "ExecutionState":
-        # Create a deep copy of the input data to ensure independence
-        data = copy.deepcopy(data)
+        # Copy the mutable parts so the new state never aliases the stored step
+        data = {
+            **data,
+            "shared": _snapshot(data["shared"]),
+            "awaiting_input": _snapshot(data.get("awaiting_input")),
+            "metadata": _snapshot(data.get("metadata", {})),
+        }
 
         # Convert string node statuses back to enum values
         node_statuses = {}
@@ -77,7 +154,49 @@ class ExecutionState:
             metadata=data.get("metadata", {}),
         )
 
+class _EdgeMap(dict):
+    """Edge dict that counts mutations so nodes know when to rebuild their plan"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.version += 1
+
+    def clear(self):
+        super().clear()
+        self.version += 1
+
+    def pop(self, *args):
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+
+    def setdefault(self, *args):
+        self.version += 1
+        return super().setdefault(*args)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+
 class ConditionSetter:
+    __slots__ = ("from_node", "condition")
+
     def __init__(self, from_node: "Node", condition: str):
         self.from_node = from_node
         self.condition = condition
@@ -92,6 +211,15 @@ class ConditionSetter:
 class Node(ABC):
     """Unified base class for all nodes"""
 
+    # Subclasses still get a __dict__; the slots keep hot base attributes off it
+    __slots__ = ("id", "type", "config", "_edges", "_plan", "max_retries", "wait")
+
+    # Set per subclass on registration; sync methods may still return awaitables
+    _prepare_is_async = False
+    _execute_is_async = False
+    _cleanup_is_async = False
+    _fallback_is_async = False
+
     def __init__(
         self,
         id: Optional[str] = None,
@@ -102,28 +230,73 @@ class Node(ABC):
         self.id = id or f"{self.__class__.__name__}_{uuid4().hex[:8]}"
         self.type = self.__class__.__name__
         self.config = config or {}
-        self.edges: Dict[str, "Edge"] = {}
+        self.edges = _EdgeMap()
         self.max_retries = max_retries
         self.wait = wait
-        self.cur_retry = 0
 
     def __init_subclass__(cls, **kwargs):
         """Auto-register nodes"""
         super().__init_subclass__(**kwargs)
-        if not inspect.isabstract(cls):
-            _NODE_REGISTRY[cls.__name__] = cls
+        _register_node(cls)
+
+    @property
+    def edges(self) -> Dict[str, "Edge"]:
+        return self._edges
+
+    @edges.setter
+    def edges(self, edges: Dict[str, "Edge"]) -> None:
+        self._edges = edges if isinstance(edges, _EdgeMap) else _EdgeMap(edges)
+        self._plan = None
+
+    def _transition_plan(self) -> tuple:
+        """Classify edges once per edge or condition change: (always, checks, to_ids, default)"""
+        # Edge versions only grow, so their sum changes whenever a condition does
+        version = (
+            self._edges.version,
+            sum(edge._version for edge in self._edges.values()),
+        )
+        if self._plan is None or self._plan[0] != version:
+            always_to_id = None
+            default_to_id = None
+            conditional = []
+            # Equivalent conditions share a code object; only the first such
+            # edge can ever be taken, so later ones are never evaluated
+            seen_codes = set()
+            for edge in self._edges.values():
+                condition = edge.condition
+                # Non-string conditions (e.g. JSON null) never match, like a bad expression
+                condition = condition.strip() if isinstance(condition, str) else None
+                if condition == "True":
+                    if always_to_id is None:
+                        always_to_id = edge.to_id
+                elif condition == "":
+                    if default_to_id is None:
+                        default_to_id = edge.to_id
+                elif condition != "False":
+                    if edge._code is not None:
+                        if edge._code in seen_codes:
+                            continue
+                        seen_codes.add(edge._code)
+                    conditional.append(edge)
+            # Parallel tuples of bound checks and targets keep attribute
+            # lookups out of the per-step loop
+            self._plan = (
+                version,
+                always_to_id,
+                tuple(edge.should_transition for edge in conditional),
+                tuple(edge.to_id for edge in conditional),
+                default_to_id,
+            )
+        return self._plan[1:]
 
     def get_next_node_id(self, state: ExecutionState) -> Optional[str]:
-        for edge in self.edges.values():
-            if edge.condition == "True":
-                return edge.to_id
-        default_edge = None
-        for edge in self.edges.values():
-            if edge.condition == "" and default_edge is None:
-                default_edge = edge
-            elif edge.should_transition(state):
-                return edge.to_id
-        return default_edge.to_id if default_edge else None
+        always_to_id, checks, to_ids, default_to_id = self._transition_plan()
+        if always_to_id is not None:
+            return always_to_id
+        for check, to_id in zip(checks, to_ids):
+            if check(state):
+                return to_id
+        return default_to_id
 
     def add_edge(self, edge: "Edge") -> None:
         self.edges[edge.to_id] = edge
@@ -131,7 +304,7 @@ class Node(ABC):
     @classmethod
     def from_dict(cls, data: dict) -> "Node":
         """Factory method to create appropriate node type"""
-        node_type = _NODE_REGISTRY.get(data["class"])
+        node_type = _resolve_node_type(data["class"])
         if not node_type:
             raise ValueError(
                 f"Unknown node type: {data['class']}. "
@@ -145,28 +318,25 @@ class Node(ABC):
         request_input: Callable[[str, str, str, str], Any]
     ) -> Any:
         try:
-            prep_result = self.prepare(
-                state.shared,
-                request_input,
-            )
-            prepared_result = (
-                await prep_result if inspect.isawaitable(prep_result) else prep_result
-            )
+            if self._prepare_is_async:
+                prepared_result = await self.prepare(state.shared, request_input)
+            else:
+                prepared_result = self.prepare(state.shared, request_input)
+                if _is_awaitable(prepared_result):
+                    prepared_result = await prepared_result
 
             execution_result = await self._execute_with_retry(
                 prepared_result
             )
 
-            cleanup_result = self.cleanup(
-                state.shared,
-                prepared_result,
-                execution_result,
-            )
-            _ = (
-                await cleanup_result
-                if inspect.isawaitable(cleanup_result)
-                else cleanup_result
-            )
+            if self._cleanup_is_async:
+                await self.cleanup(state.shared, prepared_result, execution_result)
+            else:
+                cleanup_result = self.cleanup(
+                    state.shared, prepared_result, execution_result
+                )
+                if _is_awaitable(cleanup_result):
+                    await cleanup_result
 
             state.node_statuses[self.id] = NodeStatus.COMPLETED
             return
@@ -181,11 +351,12 @@ class Node(ABC):
         self, prepared_result: Any
     ) -> Any:
         """Execute with retry logic, can be extended for batch processing."""
-        for self.cur_retry in range(self.max_retries):
+        # Retry count stays local so one node instance can serve concurrent runs
+        for attempt in range(self.max_retries):
             try:
                 return await self._process_item(prepared_result)
             except Exception as e:
-                if self.cur_retry == self.max_retries - 1:
+                if attempt == self.max_retries - 1:
                     return await self._handle_fallback(prepared_result, e)
                 if self.wait > 0:
                     await asyncio.sleep(self.wait)
@@ -193,19 +364,21 @@ class Node(ABC):
 
     async def _process_item(self, prepared_result: Any) -> Any:
         """Process a single item."""
-        result = self.execute(
-            prepared_result
-        )
-        return await result if inspect.isawaitable(result) else result
+        if self._execute_is_async:
+            return await self.execute(prepared_result)
+        result = self.execute(prepared_result)
+        return await result if _is_awaitable(result) else result
 
     async def _handle_fallback(self, prepared_result: Any, e: Exception) -> Any:
         """Handle execution failure with fallback."""
+        if self._fallback_is_async:
+            return await self.exec_fallback(prepared_result, e)
         fallback_result = self.exec_fallback(
             prepared_result, e
         )
         return (
             await fallback_result
-            if inspect.isawaitable(fallback_result)
+            if _is_awaitable(fallback_result)
             else fallback_result
         )
 
@@ -233,25 +406,25 @@ class Node(ABC):
             )
 
         try:
-            prep_result = self.prepare(
-                current_shared_state, _dummy_request_input
-            )
-            prepared_data = (
-                await prep_result if inspect.isawaitable(prep_result) else prep_result
-            )
+            if self._prepare_is_async:
+                prepared_data = await self.prepare(
+                    current_shared_state, _dummy_request_input
+                )
+            else:
+                prepared_data = self.prepare(current_shared_state, _dummy_request_input)
+                if _is_awaitable(prepared_data):
+                    prepared_data = await prepared_data
 
             execution_result = await self._process_item(prepared_data)
 
-            cleanup_result = self.cleanup(
-                current_shared_state,
-                prepared_data,
-                execution_result,
-            )
-            _ = (
-                await cleanup_result
-                if inspect.isawaitable(cleanup_result)
-                else cleanup_result
-            )
+            if self._cleanup_is_async:
+                await self.cleanup(current_shared_state, prepared_data, execution_result)
+            else:
+                cleanup_result = self.cleanup(
+                    current_shared_state, prepared_data, execution_result
+                )
+                if _is_awaitable(cleanup_result):
+                    await cleanup_result
 
             return current_shared_state
 
@@ -269,17 +442,114 @@ class Node(ABC):
         return other
 
 
+_COMPARE_OPS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+
+def _specialize_condition(tree: ast.Expression) -> Optional[Callable[[dict], Any]]:
+    """Turn `shared[<literal>] <op> <literal>` into a closure over the shared dict.
+
+    Returns None for anything else so the caller falls back to eval.
+    """
+    node = tree.body
+    if not (
+        isinstance(node, ast.Compare)
+        and len(node.ops) == 1
+        and type(node.ops[0]) in _COMPARE_OPS
+        and isinstance(node.left, ast.Subscript)
+        and isinstance(node.left.value, ast.Name)
+        and node.left.value.id == "shared"
+    ):
+        return None
+
+    key_node = node.left.slice
+    # Python 3.8 wraps plain subscripts in ast.Index
+    if isinstance(key_node, getattr(ast, "Index", ())):
+        key_node = key_node.value
+    try:
+        key = ast.literal_eval(key_node)
+        value = ast.literal_eval(node.comparators[0])
+    except (ValueError, TypeError, SyntaxError):
+        return None
+
+    compare = _COMPARE_OPS[type(node.ops[0])]
+    return lambda shared: compare(shared[key], value)
+
+
+# ast.dump(tree) -> (code, specialized fn or None), shared by equivalent conditions
+_CONDITION_CACHE: Dict[str, tuple] = {}
+
+
+@lru_cache(maxsize=None)
+def _compile_condition(condition: str) -> tuple:
+    """Compile a condition once per distinct source: (code, specialized fn or None)"""
+    tree = ast.parse(condition, mode="eval")
+    # Sources differing only in spacing or quoting share one evaluator
+    key = ast.dump(tree)
+    evaluator = _CONDITION_CACHE.get(key)
+    if evaluator is None:
+        evaluator = (
+            compile(tree, "<edge condition>", "eval"),
+            _specialize_condition(tree),
+        )
+        _CONDITION_CACHE[key] = evaluator
+    return evaluator
+
+
 class Edge:
+    __slots__ = (
+        "from_id", "to_id", "_condition", "_code", "_fn", "_compile_error", "_version"
+    )
+
+    # Shared by every evaluation instead of rebuilding the globals dict per call
+    _EVAL_GLOBALS = {"__builtins__": __builtins__}
+
     def __init__(self, from_id: str, to_id: str, condition: str = ""):
         self.from_id = from_id
         self.to_id = to_id
+        self._version = 0  # Bumped per condition assignment; see Node._transition_plan
         self.condition = condition
 
+    @property
+    def condition(self) -> str:
+        return self._condition
+
+    @condition.setter
+    def condition(self, condition: str) -> None:
+        """Compile the condition once so evaluation skips parsing"""
+        self._condition = condition
+        self._version += 1
+        try:
+            if not isinstance(condition, str):
+                raise TypeError(
+                    f"condition must be a string, not {type(condition).__name__}"
+                )
+            # Simple key comparisons come back as a closure that skips eval entirely
+            # Conditions typed in the UI often carry stray whitespace, which
+            # eval() tolerates but ast.parse() rejects as an indent
+            self._code, self._fn = _compile_condition(condition.strip())
+            self._compile_error = None
+        except (SyntaxError, TypeError) as e:
+            self._code = self._fn = None
+            self._compile_error = e
+
     def should_transition(self, state: ExecutionState) -> bool:
         try:
-            return eval(
-                self.condition, {"__builtins__": __builtins__}, {"shared": state.shared}
-            )
+            if self._fn is not None:
+                return self._fn(state.shared)
+            if self._code is None:
+                raise self._compile_error
+            return eval(self._code, self._EVAL_GLOBALS, {"shared": state.shared})
         except Exception as e:
             print(f"Error evaluating condition '{self.condition}': {str(e)}")
             return False
@@ -303,9 +573,15 @@ class WorkflowEngine:
         initial_shared_state: Optional[Dict[str, Any]] = None,
         nodes: Optional[List[Node]] = None,
         start: Optional[Node] = None,
+        checkpoint_every: int = 1,
     ):
         # Initialize storage backend if not provided
         self.storage = storage_backend or FileSystemStorage()
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be at least 1")
+        # Healthy steps are only recorded every N steps; see step()
+        self.checkpoint_every = checkpoint_every
+        self._steps_since_checkpoint = 0
 
         # Check if we're creating a workflow from code
         code_based = nodes is not None
@@ -330,25 +606,17 @@ class WorkflowEngine:
 
             self.workflow_id = workflow_id
 
-            with open(workflow_path, "r") as f:
-                data = json.load(f)
-
-            if not data.get("nodes"):
-                raise ValueError("No nodes found in workflow")
-
-            nodes = data.get("nodes")
-
-            nodes_dict = {
-                node_data["id"]: Node.from_dict(node_data) for node_data in nodes
-            }
-            # Add edges
-            for edge_data in data.get("edges", []):
-                edge = Edge.from_dict(edge_data)
-                nodes_dict[edge.from_id].add_edge(edge)
-
-            start_node_id = data.get("start", None) or nodes[0]["id"]
+            node_specs, start_node_id, initial_state = self._load_workflow_graph(
+                workflow_path
+            )
+            # Engines get fresh node instances and configs but share the Edge objects
+            nodes_dict = {}
+            for node_type, node_id, config, edges in node_specs:
+                node = node_type(id=node_id, config=copy.deepcopy(config))
+                node.edges = edges
+                nodes_dict[node_id] = node
             initial_shared_state = (
-                data.get("initial_state") or initial_shared_state or {}
+                _snapshot(initial_state) or initial_shared_state or {}
             )
 
             # Initialize workflow properties
@@ -371,6 +639,7 @@ class WorkflowEngine:
             self.nodes = nodes_dict
             self.start_node_id = start.id
 
+        needs_save = True
         if run_id:
             # Load source state for existing run
             self.tracking_data = self.storage.load_state(self.workflow_id, run_id)
@@ -393,6 +662,9 @@ class WorkflowEngine:
             if fork:
                 # Fork into new branch
                 self.run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]}"
+                if self.run_id == run_id:
+                    # Forked within the same millisecond; don't overwrite the source
+                    self.run_id += "_fork"
                 self.fork_details = {
                     "run_id": self.run_id,
                     "forked_from": run_id,
@@ -403,10 +675,11 @@ class WorkflowEngine:
                 self.tracking_data["steps"] = [self.execution_state.to_dict()]
             else:
                 self.run_id = run_id
-                # Continue in same run, purging newer steps
-                self.tracking_data["steps"] = self.tracking_data["steps"][
-                    : resume_from + 1
-                ]
+                steps = self.tracking_data["steps"]
+                # Resuming from the latest step leaves the stored run untouched
+                needs_save = resume_from + 1 < len(steps)
+                # Continue in same run, purging newer steps in place
+                del steps[resume_from + 1 :]
             self.current_step = resume_from
         else:
             self.run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]}"
@@ -425,14 +698,96 @@ class WorkflowEngine:
             }
             self.current_step = 0
         # Save initial state
-        self.storage.save_state(self.workflow_id, self.run_id, self.tracking_data)
+        if needs_save:
+            self.storage.save_state(self.workflow_id, self.run_id, self.tracking_data)
         self._input_futures = {}
         self._current_execute_task = None  # Track the current execute task
+        self._step_input = None  # Input data passed to the current step
+        self._save_lock = None  # Keeps this run's async saves in order
+
+    @staticmethod
+    def _load_workflow_graph(workflow_path: str) -> tuple:
+        """Parse a workflow JSON file, reusing the result until the file changes"""
+        key = (
+            os.path.abspath(workflow_path),
+            os.stat(workflow_path).st_mtime_ns,
+            _registry_version,
+        )
+        cached = _WORKFLOW_CACHE.get(key)
+        if cached is not None:
+            _WORKFLOW_CACHE.move_to_end(key)
+            return cached
+
+        with open(workflow_path, "rb") as f:
+            data = orjson.loads(f.read())
+
+        if not data.get("nodes"):
+            raise ValueError("No nodes found in workflow")
+
+        nodes = data.get("nodes")
+
+        # Resolve every class up front so all unknown types are reported at once
+        node_types = {name: _resolve_node_type(name) for name in {n["class"] for n in nodes}}
+        missing = sorted(name for name, node_type in node_types.items() if not node_type)
+        if missing:
+            raise ValueError(
+                f"Unknown node type{'s' if len(missing) > 1 else ''}: {', '.join(missing)}. "
+                f"Available types: {', '.join(sorted(_NODE_REGISTRY.keys()))}"
+            )
+
+        # Add edges
+        edges_by_node = {node_data["id"]: {} for node_data in nodes}
+        for edge_data in data.get("edges", []):
+            edge = Edge.from_dict(edge_data)
+            edges_by_node[edge.from_id][edge.to_id] = edge
+
+        # Only parsed data is cached; node instances may carry per-run state
+        node_specs = tuple(
+            (
+                node_types[node_data["class"]],
+                node_data["id"],
+                node_data.get("config", {}),
+                edges_by_node[node_data["id"]],
+            )
+            for node_data in nodes
+        )
+
+        start_node_id = data.get("start", None) or nodes[0]["id"]
+
+        # Older versions of this file will never be looked up again
+        for stale in [k for k in _WORKFLOW_CACHE if k[0] == key[0]]:
+            del _WORKFLOW_CACHE[stale]
+        cached = (node_specs, start_node_id, data.get("initial_state"))
+        _WORKFLOW_CACHE[key] = cached
+        while len(_WORKFLOW_CACHE) > _WORKFLOW_CACHE_SIZE:
+            _WORKFLOW_CACHE.popitem(last=False)
+        return cached
 
     def save_state(self) -> None:
         """Save current execution state to the storage backend"""
+        if self._record_step():
+            self.storage.append_step(self.workflow_id, self.run_id, self.tracking_data)
+
+    async def save_state_async(self) -> None:
+        """Save current execution state without blocking the event loop"""
+        if self._save_lock is None:
+            self._save_lock = asyncio.Lock()
+        # Only this run's saves wait on each other; other runs write in parallel
+        async with self._save_lock:
+            if self._record_step():
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    None,
+                    self.storage.append_step,
+                    self.workflow_id,
+                    self.run_id,
+                    self.tracking_data,
+                )
+
+    def _record_step(self) -> bool:
+        """Append the current execution state to tracking_data"""
         if not self.execution_state:
-            return
+            return False
 
         self.current_step += 1
 
@@ -444,49 +799,46 @@ class WorkflowEngine:
         # Append to steps list
         state_dict = self.execution_state.to_dict()
         self.tracking_data["steps"].append(state_dict)
-
-        # Save to storage backend
-        self.storage.save_state(self.workflow_id, self.run_id, self.tracking_data)
+        return True
 
     async def execute_node(
         self, node: Node, input_data: Optional[Dict[str, Any]] = None
     ) -> Optional[str]:
-        node_id = node.id
-
-        async def request_input(
-            prompt=None, options=None, input_type="text", request_id=None
-        ):
-            actual_request_id = request_id if request_id else node_id
-            if input_data and actual_request_id in input_data:
-                node_input = input_data[actual_request_id]
-                if node_input is not None:
-                    return node_input
-
-            self.execution_state.node_statuses[node_id] = NodeStatus.WAITING_FOR_INPUT
-
-            self.execution_state.awaiting_input = {
-                "node_id": node_id,
-                "request_id": actual_request_id,
-                "prompt": prompt,
-                "options": options,
-                "input_type": input_type,
-            }
+        self._step_input = input_data
+        await node.run(self.execution_state, partial(self._request_input, node.id))
+        return
 
-            self.execution_state.workflow_status = WorkflowStatus.WAITING_FOR_INPUT
+    async def _request_input(
+        self, node_id, prompt=None, options=None, input_type="text", request_id=None
+    ):
+        actual_request_id = request_id if request_id else node_id
+        # Answers supplied with the latest step can satisfy several requests
+        step_input = self._step_input
+        if step_input and actual_request_id in step_input:
+            node_input = step_input[actual_request_id]
+            if node_input is not None:
+                return node_input
+
+        self.execution_state.node_statuses[node_id] = NodeStatus.WAITING_FOR_INPUT
+
+        self.execution_state.awaiting_input = {
+            "node_id": node_id,
+            "request_id": actual_request_id,
+            "prompt": prompt,
+            "options": options,
+            "input_type": input_type,
+        }
 
-            if hasattr(self.execution_state, "save_callback") and callable(
-                self.execution_state.save_callback
-            ):
-                self.execution_state.save_callback()
+        self.execution_state.workflow_status = WorkflowStatus.WAITING_FOR_INPUT
 
-            future = asyncio.Future()
-            self._input_futures[actual_request_id] = future
-            self.execute_event.set()
-            result = await future
-            return result
+        self._steps_since_checkpoint = 0
+        await self.save_state_async()
 
-        await node.run(self.execution_state, request_input)
-        return
+        future = asyncio.Future()
+        self._input_futures[actual_request_id] = future
+        self.execute_event.set()
+        result = await future
+        return result
 
     async def step(self, input_data=None) -> bool:
         if (
@@ -516,44 +868,42 @@ class WorkflowEngine:
 
         current_node_id = self.execution_state.next_node_id
 
-        # Set up the save callback
-        self.execution_state.save_callback = self.save_state
-
         try:
             self.execute_event = asyncio.Event()
-            node = copy.copy(self.nodes[current_node_id])
+            node = self.nodes[current_node_id]
             if self._current_execute_task:
                 if not self._input_futures[request_id] or self._input_futures[request_id].done():
                     #Something went terribly wrong
                     raise Exception(f"Execution task is halted but input future for {request_id} is not set!")
                 
                 future = self._input_futures[request_id]
+                self._step_input = input_data
                 if not future.done():
                     future.set_result(message)
                     del self._input_futures[request_id]
-                    await asyncio.sleep(0)  # Let the resumed coroutine finish
             else:
                 self._current_execute_task = asyncio.create_task(
                     self.execute_node(node, input_data)
                 )
-                event_task = asyncio.create_task(self.execute_event.wait())
-                # Wait for either task to complete
-                done, pending = await asyncio.wait(
-                    [self._current_execute_task, event_task],
-                    return_when=asyncio.FIRST_COMPLETED,
-                )
 
-                # If the event task completed, it means we're waiting for input
-                if event_task in done:
-                    # Don't cancel execute_task as it's waiting for input
-                    # We keep self._current_execute_task for next step call
-                    return False
+            # Wait until the node finishes or asks for input it wasn't given
+            event_task = asyncio.create_task(self.execute_event.wait())
+            done, pending = await asyncio.wait(
+                [self._current_execute_task, event_task],
+                return_when=asyncio.FIRST_COMPLETED,
+            )
 
-                event_task.cancel()
-                try:
-                    await event_task
-                except asyncio.CancelledError:
-                    pass
+            # If the event task completed, it means we're waiting for input
+            if event_task in done:
+                # Don't cancel execute_task as it's waiting for input
+                # We keep self._current_execute_task for next step call
+                return False
+
+            event_task.cancel()
+            try:
+                await event_task
+            except asyncio.CancelledError:
+                pass
 
             # If execute_task completed, we clear the reference to it
             if self._current_execute_task.done():
@@ -577,8 +927,15 @@ class WorkflowEngine:
                 and not self.execution_state.awaiting_input
             ):
                 self.execution_state.workflow_status = WorkflowStatus.COMPLETED
-            # Save current state
-            self.save_state()
+            # Save current state. Completion, failure and input requests are
+            # always recorded; plain progress only every checkpoint_every steps
+            self._steps_since_checkpoint += 1
+            if (
+                self._steps_since_checkpoint >= self.checkpoint_every
+                or self.execution_state.workflow_status != WorkflowStatus.HEALTHY
+            ):
+                self._steps_since_checkpoint = 0
+                await self.save_state_async()
 
             # Return whether workflow is still active
             return self.execution_state.workflow_status != WorkflowStatus.COMPLETED
@@ -586,7 +943,8 @@ class WorkflowEngine:
         except Exception as e:
             # Handle workflow-level failures
             self.execution_state.workflow_status = WorkflowStatus.FAILED
-            self.save_state()
+            self._steps_since_checkpoint = 0
+            await self.save_state_async()
             raise e
 
     def _validate_node_compatibility(self) -> None:
@@ -1,56 +1,50 @@
 import asyncio
-import time
 from watchdog.events import FileSystemEventHandler
 
 
 class FileChangeHandler(FileSystemEventHandler):
-    """Base class for handling file system changes with debouncing"""
+    """Routes node (.py) and workflow (.json) file changes to rescans.
 
-    def __init__(self, manager, extension):
+    Editors emit several events per save, so changes are debounced per file:
+    the rescan runs once the file has been quiet for DEBOUNCE_SECONDS, using
+    whatever its last event was.
+    """
+
+    DEBOUNCE_SECONDS = 0.25
+
+    def __init__(self, manager):
         self.manager = manager
-        self.last_scan = 0
         self.loop = asyncio.get_event_loop()
-        self.extension = extension
+        # path -> pending rescan; only touched from the event loop thread
+        self._pending = {}
 
     def on_modified(self, event):
-        """Handle file modification events with 1-second debounce"""
-        if event.src_path.endswith(self.extension):
-            current_time = time.time()
-            if current_time - self.last_scan > 0.1:
-                self.last_scan = current_time
-                self.last_modified_path = event.src_path
-                self.trigger_update()
-
-    def on_deleted(self, event):
-        """Handle file deletion events with debounce"""
-        if event.src_path.endswith(self.extension):
-            current_time = time.time()
-            if current_time - self.last_scan > 0.1:
-                self.last_scan = current_time
-                self.last_modified_path = event.src_path
-                self.trigger_update(deletion=True)
-
-
-class NodeChangeHandler(FileChangeHandler):
-    """Handles Python file changes for node definitions"""
+        self._schedule(event.src_path, deletion=False)
 
-    def __init__(self, manager):
-        super().__init__(manager, ".py")
+    def on_moved(self, event):
+        """Handle renames, including files replaced by atomic writes"""
+        self._schedule(event.src_path, deletion=True)
+        self._schedule(event.dest_path, deletion=False)
 
-    def trigger_update(self, deletion=False):
-        asyncio.run_coroutine_threadsafe(
-            self.manager.scan_node_file(self.last_modified_path, deletion), self.loop
+    def on_deleted(self, event):
+        self._schedule(event.src_path, deletion=True)
+
+    def _schedule(self, path, deletion):
+        # Called on the watchdog thread; hand over to the event loop
+        if path.endswith((".py", ".json")):
+            self.loop.call_soon_threadsafe(self._debounce, path, deletion)
+
+    def _debounce(self, path, deletion):
+        pending = self._pending.pop(path, None)
+        if pending is not None:
+            pending.cancel()
+        self._pending[path] = self.loop.call_later(
+            self.DEBOUNCE_SECONDS, self._rescan, path, deletion
         )
 
-
-class WorkflowChangeHandler(FileChangeHandler):
-    """Handles JSON file changes for workflow definitions"""
-
-    def __init__(self, manager):
-        super().__init__(manager, ".json")
-
-    def trigger_update(self, deletion=False):
-        asyncio.run_coroutine_threadsafe(
-            self.manager.scan_workflow_file(self.last_modified_path, deletion),
-            self.loop,
-        )
+    def _rescan(self, path, deletion):
+        del self._pending[path]
+        if path.endswith(".py"):
+            self.loop.create_task(self.manager.scan_node_file(path, deletion))
+        else:
+            self.loop.create_task(self.manager.scan_workflow_file(path, deletion))
@@ -1,4 +1,4 @@
-import json
+import orjson
 import uuid
 
 
@@ -7,13 +7,10 @@ class InboundHandler:
     async def handle_client_message(manager, websocket, message_data):
         # Handle workflow editing messages
         workflow_id = message_data.get("workflow_id")
-        if (
-            not workflow_id or workflow_id not in manager.workflows
-        ) and not message_data["type"] == "create_workflow":
+        workflow = manager.workflows.get(workflow_id) if workflow_id else None
+        if workflow is None and not message_data["type"] == "create_workflow":
             return
 
-        workflow = manager.workflows.get(workflow_id, None)
-
         match message_data["type"]:
             case "node_created":
                 await InboundHandler._handle_node_created(
@@ -156,13 +153,13 @@ class InboundHandler:
 
     @staticmethod
     async def _handle_set_initial_state(manager, workflow, workflow_id, data):
-        workflow["initial_state"] = json.loads(data["initialState"])
+        workflow["initial_state"] = orjson.loads(data["initialState"])
         await manager.save_workflow(workflow_id)
 
     @staticmethod
     async def _handle_save_node_config(manager, workflow, workflow_id, data):
         node_id = data["nodeId"]
-        config = json.loads(data["config"])
+        config = orjson.loads(data["config"])
         for node in workflow["nodes"]:
             if node["id"] == node_id:
                 node["config"] = config
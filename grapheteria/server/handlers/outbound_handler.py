@@ -1,4 +1,5 @@
-import json
+import asyncio
+import orjson
 from fastapi import WebSocket
 from typing import Set, Dict, Any
 
@@ -7,44 +8,44 @@ class OutboundHandler:
     @staticmethod
     async def send_to_websocket(websocket: WebSocket, message: Dict[str, Any]):
         """Send a message to a single WebSocket"""
-        await websocket.send_text(json.dumps(message))
+        await websocket.send_text(orjson.dumps(message).decode())
 
     @staticmethod
     async def send_to_all(clients: Set[WebSocket], message: Dict[str, Any]):
         """Send a message to all connected clients"""
-        for client in clients:
-            await OutboundHandler.send_to_websocket(client, message)
+        # Serialize once and let slow clients apply backpressure concurrently
+        payload = orjson.dumps(message).decode()
+        await asyncio.gather(*[client.send_text(payload) for client in clients])
 
     @staticmethod
-    async def send_initial_state(
-        websocket: WebSocket, node_registry: Dict, workflows: Dict
-    ):
+    def format_nodes(node_registry: Dict) -> Dict[str, Any]:
+        """Flatten the per-module node registry into the class -> [module, code] map clients use"""
+        return {
+            class_info[0]: [module_name, class_info[1]]
+            for module_name, class_list in node_registry.items()
+            for class_info in class_list
+        }
+
+    @staticmethod
+    async def send_initial_state(websocket: WebSocket, nodes: Dict, workflows: Dict):
         """Send initial application state to a new client"""
         await OutboundHandler.send_to_websocket(
             websocket,
             {
                 "type": "init",
-                "nodes": {
-                    class_info[0]: [module_name, class_info[1]]
-                    for module_name, class_list in node_registry.items()
-                    for class_info in class_list
-                },
+                "nodes": nodes,
                 "workflows": workflows,
             },
         )
 
     @staticmethod
-    async def broadcast_nodes(clients: Set[WebSocket], node_registry: Dict):
+    async def broadcast_nodes(clients: Set[WebSocket], nodes: Dict):
         """Broadcast node registry to all clients"""
         await OutboundHandler.send_to_all(
             clients,
             {
                 "type": "available_nodes",
-                "nodes": {
-                    class_info[0]: [module_name, class_info[1]]
-                    for module_name, class_list in node_registry.items()
-                    for class_info in class_list
-                },
+                "nodes": nodes,
             },
         )
 
@@ -1,16 +1,13 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import FileResponse
-from fastapi.requests import Request
+from fastapi.responses import Response
+from fastapi.staticfiles import StaticFiles
+import mimetypes
 import os
 import uvicorn
 from watchdog.observers import Observer
 from grapheteria.server.workflow_manager import WorkflowManager
-from grapheteria.server.handlers.file_handlers import (
-    NodeChangeHandler,
-    WorkflowChangeHandler,
-)
+from grapheteria.server.handlers.file_handlers import FileChangeHandler
 from grapheteria.server.routes import router as api_router
 
 # Create WorkflowManager instance
@@ -24,10 +21,7 @@ observer = Observer()
 async def lifespan(app: FastAPI):
     watch_dir = os.environ.get("WORKFLOW_WATCH_DIR", ".")
     observer.schedule(
-        NodeChangeHandler(workflow_manager), path=watch_dir, recursive=True
-    )
-    observer.schedule(
-        WorkflowChangeHandler(workflow_manager), path=watch_dir, recursive=True
+        FileChangeHandler(workflow_manager), path=watch_dir, recursive=True
     )
     observer.start()
     workflow_manager.setup_node_registry()
@@ -38,7 +32,8 @@ async def lifespan(app: FastAPI):
     yield
 
     observer.stop()
-    observer.join()
+    # The watcher thread is a daemon, so don't let it hold up shutdown
+    observer.join(timeout=2.0)
 
 
 # Create FastAPI app
@@ -47,27 +42,33 @@ app = FastAPI(title="Workflow Server", lifespan=lifespan)
 # API routes
 app.include_router(api_router, prefix="/api")
 
-# Set up templates
 package_dir = os.path.dirname(os.path.abspath(__file__))
 static_dir = os.path.join(package_dir, "static", "ui")
-templates = Jinja2Templates(directory=static_dir)
+# The built index.html is a static SPA shell. The full app reads it once on
+# first request; otherwise it is re-read so a UI rebuild's new asset names show up
+_index_html = None
 
 
-# Serve index.html using templates
 @app.get("/ui/")
-async def get_ui(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
-
-
-# Serve assets with explicit MIME type handling
-@app.get("/assets/{file_path:path}")
-async def get_asset(file_path: str):
-    assets_dir = os.path.join(static_dir, "assets")
-    file_path = os.path.join(assets_dir, file_path)
-
-    if os.path.exists(file_path) and file_path.endswith(".js"):
-        return FileResponse(file_path, media_type="application/javascript")
-    return FileResponse(file_path)
+async def get_ui():
+    global _index_html
+    if _index_html is not None:
+        return Response(content=_index_html, media_type="text/html")
+    with open(os.path.join(static_dir, "index.html"), "rb") as f:
+        index_html = f.read()
+    if os.environ.get("WORKFLOW_APP_MODE") == "full":
+        _index_html = index_html
+    return Response(content=index_html, media_type="text/html")
+
+
+# Serve assets straight from disk; some platforms map .js to text/plain,
+# which browsers refuse for module scripts
+mimetypes.add_type("application/javascript", ".js")
+app.mount(
+    "/assets",
+    StaticFiles(directory=os.path.join(static_dir, "assets"), check_dir=False),
+    name="assets",
+)
 
 
 # Redirect from root to /ui/
@@ -108,14 +109,23 @@ def run_app():
     os.environ["WORKFLOW_APP_MODE"] = "full"
     
     # Auto-launch the UI in the default web browser
+    import socket
     import webbrowser
     import threading
     import time
     
     def open_browser():
-        time.sleep(1.5)  # Small delay to let the server start
-        url = f"http://{os.environ.get('HOST', '127.0.0.1')}:{os.environ.get('PORT', 8000)}/ui/"
-        webbrowser.open(url)
+        host = os.environ.get("HOST", "127.0.0.1")
+        port = int(os.environ.get("PORT", 8000))
+        # Wait until the server accepts connections, giving up after 5 seconds
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection((host, port), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.02)
+        webbrowser.open(f"http://{host}:{port}/ui/")
     
     # Launch browser in a separate thread to avoid blocking server startup
     threading.Thread(target=open_browser, daemon=True).start()
@@ -1,9 +1,108 @@
-from grapheteria import WorkflowEngine
+import asyncio
+from collections import OrderedDict
+import os
+import threading
+import weakref
+import grapheteria
+from grapheteria import WorkflowEngine, WorkflowStatus
 from fastapi import APIRouter, HTTPException, Body
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, Response
 from typing import Dict, Any, Optional
-from grapheteria.utils import FileSystemStorage
+import orjson
+from grapheteria.utils import FileSystemStorage, id_to_path
+
+
+class OrjsonFallbackResponse(ORJSONResponse):
+    """Serialize with orjson, deferring to jsonable_encoder only for values it can't handle.
+
+    Routes return this directly rather than plain values, so FastAPI's
+    recursive jsonable_encoder pass over the whole (potentially large)
+    tracking data is skipped.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS
+        )
+
 
 router = APIRouter()
+# Stateless, so one instance serves every log request
+_STORAGE = FileSystemStorage()
+
+# Engines of runs being stepped from the UI, least recently used first:
+# (workflow_id, run_id) -> ((workflow file mtime, node registry version), engine)
+MAX_LIVE_ENGINES = 64
+_live_engines: "OrderedDict[tuple, tuple]" = OrderedDict()
+# One lock per run being stepped, so concurrent requests don't share an engine's
+# in-flight execution; entries disappear once no request holds them
+_run_locks: "weakref.WeakValueDictionary[tuple, asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _run_lock(workflow_id: str, run_id: str) -> asyncio.Lock:
+    key = (workflow_id, run_id)
+    lock = _run_locks.get(key)
+    if lock is None:
+        lock = _run_locks[key] = asyncio.Lock()
+    return lock
+
+
+def _discard_engine(workflow: WorkflowEngine) -> None:
+    # A run paused for input holds a task awaiting its answer
+    if workflow._current_execute_task:
+        workflow._current_execute_task.cancel()
+
+
+def _get_engine(
+    workflow_id: str, run_id: str, resume_from: Optional[int], fork: bool
+) -> WorkflowEngine:
+    """Continue the live engine of a run stepped from its latest step, else load one.
+
+    Rebuilding from storage re-reads the run's whole history, so it is only
+    done when forking, rewinding, or after the workflow file or a node module
+    was reloaded.
+    """
+    version = (
+        os.stat(id_to_path(workflow_id)).st_mtime_ns,
+        grapheteria._registry_version,
+    )
+    key = (workflow_id, run_id)
+    cached = _live_engines.pop(key, None)
+    if cached is not None:
+        cached_version, workflow = cached
+        latest = len(workflow.tracking_data["steps"]) - 1
+        if (
+            not fork
+            and cached_version == version
+            and resume_from in (None, latest)
+        ):
+            _live_engines[key] = cached
+            return workflow
+        if not fork:
+            # This run is about to be rewritten from storage
+            _discard_engine(workflow)
+        else:
+            _live_engines[key] = cached
+
+    workflow = WorkflowEngine(
+        workflow_id=workflow_id, run_id=run_id, resume_from=resume_from, fork=fork
+    )
+    _live_engines[(workflow_id, workflow.run_id)] = (version, workflow)
+    while len(_live_engines) > MAX_LIVE_ENGINES:
+        _, (_, evicted) = _live_engines.popitem(last=False)
+        _discard_engine(evicted)
+    return workflow
+
+
+def _release_if_finished(workflow: WorkflowEngine) -> None:
+    if workflow.execution_state.workflow_status in (
+        WorkflowStatus.COMPLETED,
+        WorkflowStatus.FAILED,
+    ):
+        _live_engines.pop((workflow.workflow_id, workflow.run_id), None)
 
 
 @router.get("/workflows/create/{workflow_id}")
@@ -13,11 +112,13 @@ async def create_workflow(workflow_id: str):
 
         run_id = workflow.run_id
 
-        return {
-            "message": "Workflow created",
-            "run_id": run_id,
-            "execution_data": workflow.tracking_data,
-        }
+        return OrjsonFallbackResponse(
+            {
+                "message": "Workflow created",
+                "run_id": run_id,
+                "execution_data": workflow.tracking_data,
+            }
+        )
     except Exception as e:
         print(e)
         raise HTTPException(
@@ -33,19 +134,20 @@ async def step_workflow(
     resume_from: Optional[int] = Body(None),
     fork: bool = Body(False),
 ):
-    # Create new workflow with specified parameters
-    workflow = WorkflowEngine(
-        workflow_id=workflow_id, run_id=run_id, resume_from=resume_from, fork=fork
-    )
-
-    try:
-        await workflow.step(input_data=input_data)
-    except Exception:
-        # Just catch the exception, don't return here
-        pass
-
-    # Return response regardless of whether an exception occurred
-    return {"message": "Workflow stepped", "execution_data": workflow.tracking_data}
+    async with _run_lock(workflow_id, run_id):
+        workflow = _get_engine(workflow_id, run_id, resume_from, fork)
+
+        try:
+            await workflow.step(input_data=input_data)
+        except Exception:
+            # Just catch the exception, don't return here
+            pass
+        _release_if_finished(workflow)
+
+        # Return response regardless of whether an exception occurred
+        return OrjsonFallbackResponse(
+            {"message": "Workflow stepped", "execution_data": workflow.tracking_data}
+        )
 
 
 @router.post("/workflows/run/{workflow_id}/{run_id}")
@@ -56,30 +158,60 @@ async def run_workflow(
     resume_from: Optional[int] = Body(None),
     fork: bool = Body(False),
 ):
-    # Create new workflow with specified parameters
-    workflow = WorkflowEngine(
-        workflow_id=workflow_id, run_id=run_id, resume_from=resume_from, fork=fork
-    )
-
-    try:
-        await workflow.run(input_data=input_data)
-    except Exception:
-        # Just catch the exception, don't return here
-        pass
-
-    return {"message": "Workflow run", "execution_data": workflow.tracking_data}
+    async with _run_lock(workflow_id, run_id):
+        workflow = _get_engine(workflow_id, run_id, resume_from, fork)
+
+        try:
+            await workflow.run(input_data=input_data)
+        except Exception:
+            # Just catch the exception, don't return here
+            pass
+        _release_if_finished(workflow)
+
+        return OrjsonFallbackResponse(
+            {"message": "Workflow run", "execution_data": workflow.tracking_data}
+        )
 
 
+# The log routes read from disk, so they are plain functions that FastAPI
+# runs in its threadpool rather than on the event loop
 @router.get("/logs")
-async def get_logs():
-    return FileSystemStorage().list_workflows()
+def get_logs():
+    return OrjsonFallbackResponse(_STORAGE.list_workflows())
 
 
 @router.get("/logs/{workflow_id}")
-async def get_workflow_logs(workflow_id: str):
-    return FileSystemStorage().list_runs(workflow_id)
+def get_workflow_logs(workflow_id: str):
+    return OrjsonFallbackResponse(_STORAGE.list_runs(workflow_id))
+
+
+# Encoded bodies of recently viewed runs: (workflow_id, run_id) -> (file version, body)
+_RUN_LOG_CACHE_SIZE = 16
+_run_log_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_run_log_lock = threading.Lock()
 
 
 @router.get("/logs/{workflow_id}/{run_id}")
-async def get_run_logs(workflow_id: str, run_id: str):
-    return FileSystemStorage().load_state(workflow_id, run_id)
+def get_run_logs(workflow_id: str, run_id: str):
+    state_file = os.path.join(_STORAGE.base_dir, workflow_id, run_id, "state.pkl")
+    try:
+        stat = os.stat(state_file)
+    except FileNotFoundError:
+        return OrjsonFallbackResponse(None)
+
+    # Steps are appended to the file, so its size changes even within one mtime tick
+    key = (workflow_id, run_id)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _run_log_lock:
+        cached = _run_log_cache.get(key)
+        if cached is not None and cached[0] == version:
+            _run_log_cache.move_to_end(key)
+            return Response(content=cached[1], media_type="application/json")
+
+    response = OrjsonFallbackResponse(_STORAGE.load_state(workflow_id, run_id))
+    with _run_log_lock:
+        _run_log_cache[key] = (version, response.body)
+        _run_log_cache.move_to_end(key)
+        if len(_run_log_cache) > _RUN_LOG_CACHE_SIZE:
+            _run_log_cache.popitem(last=False)
+    return response
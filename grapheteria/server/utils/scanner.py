@@ -4,7 +4,7 @@ import inspect
 import os
 import json
 import importlib.util
-from grapheteria import Node, _NODE_REGISTRY
+from grapheteria import Node, _register_node
 from grapheteria.utils import path_to_id
 import sys
 
@@ -29,8 +29,7 @@ class SystemScanner:
         def custom_init_subclass(cls, **kwargs):
             """Modified auto-register that properly captures nodes based on module"""
             super(Node, cls).__init_subclass__(**kwargs)
-            if not inspect.isabstract(cls):
-                _NODE_REGISTRY[cls.__name__] = cls
+            if _register_node(cls):
                 code = inspect.getsource(cls)
                 temp[cls.__module__].append([cls.__name__, code])
 
@@ -95,7 +94,7 @@ class SystemScanner:
 
         module_name = path_to_id(file_path)
         if deletion:
-            del manager.node_registry[module_name]
+            manager.node_registry.pop(module_name, None)
         else:
             # Save original path
             original_path = sys.path.copy()
@@ -1,5 +1,5 @@
 from grapheteria.utils import id_to_path
-import json
+import orjson
 import os
 from fastapi import WebSocket
 from grapheteria.server.handlers.inbound_handler import InboundHandler
@@ -7,17 +7,34 @@ from grapheteria.server.handlers.outbound_handler import OutboundHandler
 from grapheteria.server.utils.scanner import SystemScanner
 
 
+def _write_atomic(path: str, data: bytes) -> None:
+    """Write a file in one call via a temp file, so readers never see it half-written"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
 class WorkflowManager:
     def __init__(self):
         self.clients = set()
         self.node_registry = {}
         self.workflows = {}
+        # Client-facing view of node_registry, rebuilt only after a rescan
+        self._available_nodes = None
 
     def setup_node_registry(self):
         SystemScanner.setup_node_registry()
 
     def scan_nodes(self):
         SystemScanner.scan_nodes(self)
+        self._available_nodes = None
+
+    @property
+    def available_nodes(self):
+        if self._available_nodes is None:
+            self._available_nodes = OutboundHandler.format_nodes(self.node_registry)
+        return self._available_nodes
 
     def scan_workflows(self):
         SystemScanner.scan_workflows(self)
@@ -25,18 +42,20 @@ class WorkflowManager:
     async def register(self, websocket: WebSocket):
         self.clients.add(websocket)
         await OutboundHandler.send_initial_state(
-            websocket, self.node_registry, self.workflows
+            websocket, self.available_nodes, self.workflows
         )
 
     async def unregister(self, websocket: WebSocket):
         self.clients.remove(websocket)
 
     async def handle_client_message(self, websocket, message):
-        data = json.loads(message)
+        data = orjson.loads(message)
         await InboundHandler.handle_client_message(self, websocket, data)
 
     async def broadcast_nodes(self):
-        await OutboundHandler.broadcast_nodes(self.clients, self.node_registry)
+        # Only called after node_registry changed
+        self._available_nodes = None
+        await OutboundHandler.broadcast_nodes(self.clients, self.available_nodes)
 
     async def broadcast_workflows(self):
         await OutboundHandler.broadcast_workflows(self.clients, self.workflows)
@@ -49,13 +68,12 @@ class WorkflowManager:
 
     async def save_workflow(self, workflow_id):
         """Save workflow to original file"""
-        if workflow_id not in self.workflows:
+        workflow = self.workflows.get(workflow_id)
+        if workflow is None:
             return
 
-        workflow = self.workflows[workflow_id]
         file_path = id_to_path(workflow_id)
-        with open(file_path, "w") as f:
-            json.dump(workflow, f, indent=2)
+        _write_atomic(file_path, orjson.dumps(workflow, option=orjson.OPT_INDENT_2))
 
     async def create_workflow(self, workflow_id: str):
         if workflow_id in self.workflows:
@@ -65,8 +83,7 @@ class WorkflowManager:
             "nodes": [],
         }
         file_path = id_to_path(workflow_id)
-        with open(file_path, "w") as f:
-            json.dump(workflow, f, indent=2)
+        _write_atomic(file_path, orjson.dumps(workflow, option=orjson.OPT_INDENT_2))
 
     async def update_node_source(
         self, module: str, node_class_name: str, new_class_source: str
@@ -123,8 +140,7 @@ class WorkflowManager:
                 return False
 
             # Write the modified code back to the file
-            with open(source_file, "w") as f:
-                f.write(modified_module.code)
+            _write_atomic(source_file, modified_module.code.encode())
 
             return True
         except Exception as e:
@@ -154,8 +170,7 @@ class WorkflowManager:
             if not os.path.exists(source_file):
                 # Add import statement before the class source
                 file_content = "from grapheteria import Node\n\n" + new_class_source
-                with open(source_file, "w") as f:
-                    f.write(file_content)
+                _write_atomic(source_file, file_content.encode())
 
                 return True
 
@@ -208,8 +223,7 @@ class WorkflowManager:
             )
 
             # Write the modified code back to the file
-            with open(source_file, "w") as f:
-                f.write(modified_module.code)
+            _write_atomic(source_file, modified_module.code.encode())
             return True
         except Exception as e:
             print(f"Error adding source for {module}.{node_class_name}: {e}")
@@ -1,10 +1,56 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List
 import json
+import math
 import os
+import re
 from contextlib import contextmanager
 import sqlite3
+from collections import OrderedDict
 from dill import dump, load
+import orjson
+
+
+def _has_non_finite(obj: Any) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    return False
+
+
+def _dumps(obj) -> str:
+    """Encode JSON text; orjson is several times faster than the json module.
+
+    orjson rejects integers wider than 64 bits and writes NaN/Infinity as
+    null, so those values go through json.dumps, which keeps them.
+    """
+    try:
+        # Non-string keys are stringified like json.dumps would
+        encoded = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        return json.dumps(obj)
+    # Non-finite floats can only hide behind a null
+    if b"null" in encoded and _has_non_finite(obj):
+        return json.dumps(obj)
+    return encoded.decode()
+
+
+# orjson parses integers beyond 64 bits as floats, losing precision
+_WIDE_INT = re.compile(r"\d{19,}")
+
+
+def _loads(text: str) -> Any:
+    """Decode JSON text written by _dumps"""
+    if _WIDE_INT.search(text):
+        return json.loads(text)
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        # NaN/Infinity from the json.dumps fallback
+        return json.loads(text)
 
 
 class StorageBackend(ABC):
@@ -20,6 +66,14 @@ class StorageBackend(ABC):
         """Load a workflow execution state."""
         pass
 
+    def append_step(self, workflow_id: str, run_id: str, save_data: dict) -> None:
+        """Persist the newest entry of save_data["steps"].
+
+        Backends that can append incrementally should override this; the
+        default rewrites the whole state.
+        """
+        self.save_state(workflow_id, run_id, save_data)
+
     def list_runs(self, workflow_id: str) -> List[str]:
         """List all runs for a given workflow."""
         pass
@@ -46,13 +100,33 @@ class FileSystemStorage(StorageBackend):
         except Exception as e:
             raise e
 
+    def append_step(self, workflow_id: str, run_id: str, save_data: dict) -> None:
+        # Pickles are self-delimiting, so new steps are appended after the
+        # saved state instead of rewriting the whole history every step
+        dill_file = f"{self.base_dir}/{workflow_id}/{run_id}/state.pkl"
+        try:
+            with open(dill_file, "ab") as f:
+                if f.tell() > 0:
+                    dump(save_data["steps"][-1], f)
+                    return
+        except FileNotFoundError:
+            pass
+        self.save_state(workflow_id, run_id, save_data)
+
     def load_state(self, workflow_id: str, run_id: str) -> Optional[Dict]:
         dill_file = f"{self.base_dir}/{workflow_id}/{run_id}/state.pkl"
         if not os.path.exists(dill_file):
             return None
 
         with open(dill_file, "rb") as f:
-            return load(f)
+            data = load(f)
+            # Replay any steps appended after the last full save
+            while True:
+                try:
+                    data["steps"].append(load(f))
+                except EOFError:
+                    break
+        return data
 
     def list_runs(self, workflow_id: str) -> List[str]:
         workflow_dir = f"{self.base_dir}/{workflow_id}"
@@ -78,12 +152,20 @@ class FileSystemStorage(StorageBackend):
 class SQLiteStorage(StorageBackend):
     """SQLite implementation of storage backend."""
 
+    # Number of runs whose encoded steps are kept for incremental saves
+    _STEP_CACHE_SIZE = 16
+
     def __init__(self, db_path: str = "workflows.db"):
         self.db_path = db_path
+        # (workflow_id, run_id) -> JSON-encoded steps, so each step is encoded once
+        self._encoded_steps: "OrderedDict[tuple, List[str]]" = OrderedDict()
         self._init_db()
 
     def _init_db(self):
         with self._get_connection() as conn:
+            # WAL is persistent for the database file; per-step commits then
+            # append to the log instead of fsyncing the main file each time
+            conn.execute("PRAGMA journal_mode=WAL")
             cursor = conn.cursor()
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS workflow_states (
@@ -99,12 +181,38 @@ class SQLiteStorage(StorageBackend):
     @contextmanager
     def _get_connection(self):
         conn = sqlite3.connect(self.db_path)
+        # With WAL this only syncs at checkpoints, still crash-safe for the database
+        conn.execute("PRAGMA synchronous=NORMAL")
         try:
             yield conn
         finally:
             conn.close()
 
     def save_state(self, workflow_id: str, run_id: str, save_data: dict) -> None:
+        encoded = [_dumps(step) for step in save_data.get("steps", [])]
+        self._write(workflow_id, run_id, save_data, encoded)
+
+    def append_step(self, workflow_id: str, run_id: str, save_data: dict) -> None:
+        encoded = self._encoded_steps.get((workflow_id, run_id))
+        steps = save_data["steps"]
+        if encoded is None or len(encoded) != len(steps) - 1:
+            self.save_state(workflow_id, run_id, save_data)
+            return
+        self._write(workflow_id, run_id, save_data, encoded + [_dumps(steps[-1])])
+
+    def _write(
+        self, workflow_id: str, run_id: str, save_data: dict, encoded: List[str]
+    ) -> None:
+        # Splice the already-encoded steps into the document instead of
+        # re-encoding the whole history
+        document = _dumps({k: v for k, v in save_data.items() if k != "steps"})
+        if "steps" in save_data:
+            steps_json = '"steps": [' + ", ".join(encoded) + "]"
+            if document == "{}":
+                document = "{" + steps_json + "}"
+            else:
+                document = document[:-1] + ", " + steps_json + "}"
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -112,10 +220,16 @@ class SQLiteStorage(StorageBackend):
                 INSERT OR REPLACE INTO workflow_states (workflow_id, run_id, state_json, updated_at)
                 VALUES (?, ?, ?, CURRENT_TIMESTAMP)
                 """,
-                (workflow_id, run_id, json.dumps(save_data)),
+                (workflow_id, run_id, document),
             )
             conn.commit()
 
+        key = (workflow_id, run_id)
+        self._encoded_steps[key] = encoded
+        self._encoded_steps.move_to_end(key)
+        if len(self._encoded_steps) > self._STEP_CACHE_SIZE:
+            self._encoded_steps.popitem(last=False)
+
     def load_state(self, workflow_id: str, run_id: str) -> Optional[Dict]:
         with self._get_connection() as conn:
             cursor = conn.cursor()
@@ -128,7 +242,7 @@ class SQLiteStorage(StorageBackend):
         if not row:
             return None
 
-        return json.loads(row[0])
+        return _loads(row[0])
 
 
 def path_to_id(workflow_path):
@@ -1,5 +1,5 @@
 import pytest
-from grapheteria import Node, ExecutionState, WorkflowStatus
+from grapheteria import Node, Edge, ExecutionState, WorkflowStatus
 
 class SimpleNode(Node):
     """A simple test node implementation"""
@@ -306,3 +306,163 @@ async def test_edge_in_workflow_execution(base_workflow):
     # Second run should go: start -> router -> high -> end
     assert path == ["start", "router", "high", "end"]
     assert state.shared["count"] == 5  # 2 + 3 more increments
+
+def test_edge_condition_recompiled_on_change(base_workflow):
+    """Test that reassigning a condition replaces the compiled expression"""
+    start = base_workflow["start"]
+    process_a = base_workflow["process_a"]
+
+    start - "shared['value'] > 10" > process_a
+    edge = start.edges["process_a"]
+
+    state = ExecutionState(
+        shared={"value": 5},
+        next_node_id="start",
+        workflow_status=WorkflowStatus.HEALTHY
+    )
+
+    assert not edge.should_transition(state)
+
+    edge.condition = "shared['value'] < 10"
+    assert edge.should_transition(state)
+
+    edge.condition = "not valid python"
+    assert edge.should_transition(state) is False
+
+    # The node's transition plan follows reassigned conditions too
+    process_b = base_workflow["process_b"]
+    process_c = base_workflow["process_c"]
+    edge.condition = "shared['value'] > 10"
+    start - "shared['value'] > 10" > process_b
+    start - "shared['value'] > 20" > process_c
+    assert start.get_next_node_id(state) is None
+
+    # A former duplicate is evaluated once its condition differs
+    start.edges["process_b"].condition = "shared['value'] < 10"
+    assert start.get_next_node_id(state) == "process_b"
+
+    # An emptied condition becomes the default edge
+    start.edges["process_b"].condition = "False"
+    start.edges["process_c"].condition = ""
+    assert start.get_next_node_id(state) == "process_c"
+
+def test_specialized_conditions_match_eval():
+    """Test that fast-path conditions behave like the eval fallback"""
+    state = ExecutionState(
+        shared={"value": 5, "status": "ok"},
+        next_node_id="start",
+        workflow_status=WorkflowStatus.HEALTHY
+    )
+
+    cases = {
+        "shared['value'] == 5": True,
+        "shared['value'] >= 6": False,
+        "shared['status'] in ('ok', 'done')": True,
+        "shared['status'] is not None": True,
+        "shared['missing'] == 1": False,
+        "shared['value'] + 1 == 6": True,
+    }
+    for condition, expected in cases.items():
+        edge = Edge("a", "b", condition)
+        assert edge.should_transition(state) is expected, condition
+
+    assert Edge("a", "b", "shared['value'] == 5")._fn is not None
+    assert Edge("a", "b", "shared['value'] + 1 == 6")._fn is None
+
+def test_equivalent_conditions_share_evaluator():
+    """Test that conditions differing only in formatting are compiled once"""
+    first = Edge("a", "b", "shared['value']>5")
+    second = Edge("c", "d", 'shared["value"] > 5')
+
+    assert first._code is second._code
+    assert first._fn is second._fn
+
+def test_condition_whitespace_ignored(base_workflow):
+    """Test that padded conditions are classified and evaluated like trimmed ones"""
+    start = base_workflow["start"]
+
+    state = ExecutionState(
+        shared={"value": 5},
+        next_node_id="start",
+        workflow_status=WorkflowStatus.HEALTHY
+    )
+
+    assert Edge("a", "b", "  shared['value'] == 5 ").should_transition(state) is True
+
+    start - " False " > base_workflow["process_a"]
+    start - "  " > base_workflow["process_b"]
+    assert start.get_next_node_id(state) == "process_b"
+
+    start - " True\n" > base_workflow["process_c"]
+    assert start.get_next_node_id(state) == "process_c"
+
+def test_null_condition_never_matches(base_workflow):
+    """Test that a JSON edge with a null condition loads but is never taken"""
+    start = base_workflow["start"]
+
+    state = ExecutionState(
+        shared={},
+        next_node_id="start",
+        workflow_status=WorkflowStatus.HEALTHY
+    )
+
+    edge = Edge.from_dict({"from": "start", "to": "process_a", "condition": None})
+    assert edge.should_transition(state) is False
+
+    start.add_edge(edge)
+    start > base_workflow["process_b"]
+    assert start.get_next_node_id(state) == "process_b"
+
+def test_duplicate_conditions_evaluated_once(base_workflow):
+    """Test that an edge repeating an earlier condition is left out of the plan"""
+    start = base_workflow["start"]
+
+    start - "shared['value'] > 1" > base_workflow["process_a"]
+    start - "shared['value']>1" > base_workflow["process_b"]
+    start - "shared['value'] > 2" > base_workflow["process_c"]
+
+    _, _, to_ids, _ = start._transition_plan()
+    assert to_ids == ("process_a", "process_c")
+
+    state = ExecutionState(
+        shared={"value": 5},
+        next_node_id="start",
+        workflow_status=WorkflowStatus.HEALTHY
+    )
+    assert start.get_next_node_id(state) == "process_a"
+
+def test_transition_plan_tracks_edge_changes(base_workflow):
+    """Test that the precomputed transition plan follows edge mutations"""
+    start = base_workflow["start"]
+    process_a = base_workflow["process_a"]
+    process_b = base_workflow["process_b"]
+
+    start - "False" > process_a
+    start > process_b
+
+    state = ExecutionState(
+        shared={},
+        next_node_id="start",
+        workflow_status=WorkflowStatus.HEALTHY
+    )
+
+    assert start.get_next_node_id(state) == "process_b"
+
+    start - "True" > process_a
+    assert start.get_next_node_id(state) == "process_a"
+
+    del start.edges["process_a"]
+    assert start.get_next_node_id(state) == "process_b"
+
+    start.edges = {}
+    assert start.get_next_node_id(state) is None
+
+    edges = start.edges
+    edges |= {"process_a": Edge("start", "process_a")}
+    assert start.get_next_node_id(state) == "process_a"
+
+    # Edges elsewhere in the process leave this node's plan alone
+    plan = start._plan
+    Edge("x", "y", "shared['value'] > 1")
+    assert start.get_next_node_id(state) == "process_a"
+    assert start._plan is plan
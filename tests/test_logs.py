@@ -3,9 +3,11 @@ import pytest
 import os
 import tempfile
 import shutil
+import asyncio
+import threading
 
 from grapheteria import (
-    Node, WorkflowEngine, WorkflowStatus
+    Node, WorkflowEngine, WorkflowStatus, NodeStatus
 )
 from grapheteria.utils import FileSystemStorage, SQLiteStorage
 
@@ -383,4 +385,99 @@ async def test_resume_from_invalid_step(temp_log_dir, basic_workflow):
             nodes=nodes,
             resume_from=999,  # Invalid step number
             storage_backend=FileSystemStorage(base_dir=temp_log_dir)
-        )
\ No newline at end of file
+        )
+
+# Tests for Checkpoint Interval
+async def test_checkpoint_every(temp_log_dir, basic_workflow):
+    """Test that healthy steps are batched but the final state is always saved"""
+    nodes, start = basic_workflow
+    storage = FileSystemStorage(base_dir=temp_log_dir)
+
+    engine = WorkflowEngine(
+        nodes=nodes,
+        start=start,
+        storage_backend=storage,
+        checkpoint_every=2
+    )
+
+    await engine.run()
+
+    steps = storage.load_state(engine.workflow_id, engine.run_id)["steps"]
+    # Initial state, the checkpoint after two nodes, then completion
+    assert len(steps) == 3
+    assert steps[-1]["workflow_status"] == "COMPLETED"
+    assert "end_result" in steps[-1]["shared"]
+
+    with pytest.raises(ValueError):
+        WorkflowEngine(nodes=nodes, start=start, checkpoint_every=0)
+
+async def test_checkpoint_every_saves_pause_and_completion(temp_log_dir, workflow_with_input):
+    """Test that a paused and a completed run are saved even between checkpoints"""
+    nodes, start = workflow_with_input
+    input_node = nodes[1]
+    storage = FileSystemStorage(base_dir=temp_log_dir)
+
+    engine = WorkflowEngine(
+        nodes=nodes,
+        start=start,
+        storage_backend=storage,
+        checkpoint_every=10
+    )
+
+    await engine.run()
+
+    steps = storage.load_state(engine.workflow_id, engine.run_id)["steps"]
+    assert steps[-1]["workflow_status"] == "WAITING_FOR_INPUT"
+    assert steps[-1]["awaiting_input"]["node_id"] == input_node.id
+
+    await engine.run({input_node.id: "hello"})
+
+    steps = storage.load_state(engine.workflow_id, engine.run_id)["steps"]
+    assert steps[-1]["workflow_status"] == "COMPLETED"
+    assert steps[-1]["shared"]["user_input"] == {"user_input": "hello"}
+
+# Tests for Stored Format
+async def test_node_statuses_pickled_as_strings(temp_log_dir, basic_workflow):
+    """Test that pickled steps store node statuses as plain strings"""
+    nodes, start = basic_workflow
+    storage = FileSystemStorage(base_dir=temp_log_dir)
+    engine = WorkflowEngine(nodes=nodes, start=start, storage_backend=storage)
+
+    await engine.run()
+
+    steps = storage.load_state(engine.workflow_id, engine.run_id)["steps"]
+    statuses = steps[-1]["node_statuses"]
+    assert statuses[start.id] == "completed"
+    assert all(type(status) is str for status in statuses.values())
+
+    resumed = WorkflowEngine(
+        nodes=nodes,
+        start=start,
+        workflow_id=engine.workflow_id,
+        run_id=engine.run_id,
+        storage_backend=storage
+    )
+    assert resumed.execution_state.node_statuses[start.id] == NodeStatus.COMPLETED
+
+# Tests for Concurrent Saves
+async def test_saves_of_different_runs_overlap(temp_log_dir):
+    """Test that one run's save doesn't wait for another run's save to finish"""
+    class RendezvousStorage(FileSystemStorage):
+        # Each append waits until the other run's append has started
+        barrier = threading.Barrier(2, timeout=5)
+
+        def append_step(self, workflow_id, run_id, save_data):
+            self.barrier.wait()
+            super().append_step(workflow_id, run_id, save_data)
+
+    storage = RendezvousStorage(base_dir=temp_log_dir)
+    engines = [
+        WorkflowEngine(nodes=[StartNode()], storage_backend=storage)
+        for _ in range(2)
+    ]
+
+    await asyncio.gather(*(engine.step() for engine in engines))
+
+    for engine in engines:
+        steps = storage.load_state(engine.workflow_id, engine.run_id)["steps"]
+        assert len(steps) == 2
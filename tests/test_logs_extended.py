@@ -3,6 +3,7 @@ import os
 import shutil
 import tempfile
 import sqlite3
+import math
 
 from grapheteria.utils import FileSystemStorage, SQLiteStorage
 
@@ -20,8 +21,10 @@ def temp_db_path():
     """Create a temporary SQLite database path."""
     _, db_path = tempfile.mkstemp(suffix='.db')
     yield db_path
-    # Cleanup after tests
-    os.unlink(db_path)
+    # Cleanup after tests, including WAL side files
+    for path in (db_path, db_path + "-wal", db_path + "-shm"):
+        if os.path.exists(path):
+            os.unlink(path)
 
 @pytest.fixture
 def fs_storage(temp_dir):
@@ -139,6 +142,32 @@ class TestFileSystemStorage:
         assert loaded_state == updated_state
         assert len(loaded_state["steps"]) == 2
 
+    def test_append_step(self, fs_storage, sample_state):
+        """Test appending steps after an initial full save."""
+        workflow_id = "test.workflow"
+        run_id = "append_run"
+
+        fs_storage.save_state(workflow_id, run_id, sample_state)
+        for i in range(2, 5):
+            sample_state["steps"].append({"shared": {"key": i}, "metadata": {"step": i}})
+            fs_storage.append_step(workflow_id, run_id, sample_state)
+
+        loaded_state = fs_storage.load_state(workflow_id, run_id)
+
+        assert loaded_state == sample_state
+        assert len(loaded_state["steps"]) == 4
+
+        # A full save replaces any appended steps
+        sample_state["steps"] = sample_state["steps"][:2]
+        fs_storage.save_state(workflow_id, run_id, sample_state)
+        assert fs_storage.load_state(workflow_id, run_id) == sample_state
+
+    def test_append_step_without_saved_state(self, fs_storage, sample_state):
+        """Test that appending to a missing run falls back to a full save."""
+        fs_storage.append_step("test.workflow", "fresh_run", sample_state)
+
+        assert fs_storage.load_state("test.workflow", "fresh_run") == sample_state
+
 
 # SQLiteStorage Tests
 class TestSQLiteStorage:
@@ -205,6 +234,42 @@ class TestSQLiteStorage:
         assert loaded_state == updated_state
         assert len(loaded_state["steps"]) == 2
     
+    def test_append_step(self, sqlite_storage, sample_state):
+        """Test that appended steps produce the same document as a full save."""
+        workflow_id = "test.workflow"
+        run_id = "append_run"
+
+        sqlite_storage.save_state(workflow_id, run_id, sample_state)
+        for i in range(2, 5):
+            sample_state["steps"].append({"shared": {"key": i}, "metadata": {"step": i}})
+            sqlite_storage.append_step(workflow_id, run_id, sample_state)
+
+        assert sqlite_storage.load_state(workflow_id, run_id) == sample_state
+
+        # Appending to a run the instance hasn't seen falls back to a full save
+        fresh = SQLiteStorage(db_path=sqlite_storage.db_path)
+        fresh.append_step(workflow_id, "other_run", sample_state)
+        assert fresh.load_state(workflow_id, "other_run") == sample_state
+
+    def test_wide_integers_round_trip(self, sqlite_storage, sample_state):
+        """Test that integers beyond 64 bits are saved and loaded exactly."""
+        sample_state["steps"][0]["shared"] = {"big": 2**70, "small": -(2**64)}
+        sqlite_storage.save_state("test.workflow", "wide_run", sample_state)
+
+        loaded = sqlite_storage.load_state("test.workflow", "wide_run")
+        assert loaded["steps"][0]["shared"] == {"big": 2**70, "small": -(2**64)}
+
+    def test_non_finite_floats_round_trip(self, sqlite_storage, sample_state):
+        """Test that NaN and infinities aren't silently stored as null."""
+        sample_state["steps"][0]["shared"] = {
+            "values": [float("nan"), float("inf"), float("-inf"), None]
+        }
+        sqlite_storage.save_state("test.workflow", "nan_run", sample_state)
+
+        values = sqlite_storage.load_state("test.workflow", "nan_run")["steps"][0]["shared"]["values"]
+        assert math.isnan(values[0])
+        assert values[1:] == [float("inf"), float("-inf"), None]
+
     # Additional tests for list_runs and list_workflows for SQLite
     # Since these methods aren't shown in the code snippet, I'll implement them
     # based on what would be expected similar to FileSystemStorage
@@ -0,0 +1,44 @@
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip("fastmcp")
+
+SERVER_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "examples", "mcp_tool_calling", "mcp_server.py"
+)
+
+
+@pytest.fixture(scope="module")
+def mcp_server():
+    """Load the MCP example server module from its file"""
+    spec = importlib.util.spec_from_file_location("mcp_server", SERVER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def calculate(mcp_server, expression):
+    # fastmcp may wrap the tool; the evaluator underneath is what we test
+    return mcp_server._evaluate(mcp_server._parse(expression))
+
+
+def test_calculate_arithmetic(mcp_server):
+    """Test that plain arithmetic and allowed functions evaluate"""
+    assert calculate(mcp_server, "2**10 + max(1, 3) * 2") == 1030
+    assert calculate(mcp_server, "9**99**1") == 9**99
+    assert calculate(mcp_server, "2**-2") == 0.25
+
+
+@pytest.mark.parametrize("expression", ["(9**99)**99", "9**9**9", "(2**64)**1000"])
+def test_calculate_rejects_oversized_powers(mcp_server, expression):
+    """Test that nested powers are refused before the result is computed"""
+    with pytest.raises(ValueError, match="Result too large"):
+        calculate(mcp_server, expression)
+
+
+def test_calculate_rejects_names(mcp_server):
+    """Test that anything but arithmetic is refused"""
+    with pytest.raises(ValueError, match="Unsupported expression"):
+        calculate(mcp_server, "__import__('os')")
@@ -124,6 +124,16 @@ class TestNodeConfiguration:
         assert formal_result == "Dear Test User,"
         assert casual_result == "Hey Test User!"
 
+    def test_from_dict_resolves_qualified_names(self):
+        """Test that nodes can be looked up by module-qualified name."""
+        qualified = f"{ConfigurableNode.__module__}.{ConfigurableNode.__qualname__}"
+
+        node = Node.from_dict({"id": "greeter", "class": qualified})
+        short = Node.from_dict({"id": "greeter_short", "class": "ConfigurableNode"})
+
+        assert type(node) is ConfigurableNode
+        assert type(short) is ConfigurableNode
+
 
 # ======= Retry and Fallback Tests =======
 
@@ -214,6 +224,13 @@ class TestAsyncNode:
         assert result == execution_result
         assert shared["api_cache"] == "Data for user 42"
     
+    def test_async_flags_set_per_class(self):
+        assert AsyncNode._prepare_is_async
+        assert AsyncNode._execute_is_async
+        assert AsyncNode._cleanup_is_async
+        assert not AsyncNode._fallback_is_async
+        assert not ConfigurableNode._execute_is_async
+
     async def test_full_async_node_run(self, execution_state, request_input_mock):
         execution_state.shared["user_id"] = 42
         node = AsyncNode(id="test_node")
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import os
+
+import orjson
+import pytest
+
+pytest.importorskip("fastapi")
+
+import grapheteria
+from grapheteria import Node
+from grapheteria.server import routes
+
+
+class RouteStepNode(Node):
+    def cleanup(self, shared, prepared_result, execution_result):
+        shared.setdefault("visited", []).append(self.id)
+        return execution_result
+
+
+# Fixtures
+@pytest.fixture
+def workflow_id(tmp_path, monkeypatch):
+    """Write a three-node workflow into a fresh working directory"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(routes, "_live_engines", routes.OrderedDict())
+    with open("flow.json", "w") as f:
+        json.dump(
+            {
+                "nodes": [
+                    {"id": "a", "class": "RouteStepNode"},
+                    {"id": "b", "class": "RouteStepNode"},
+                    {"id": "c", "class": "RouteStepNode"},
+                ],
+                "edges": [{"from": "a", "to": "b"}, {"from": "b", "to": "c"}],
+            },
+            f,
+        )
+    return "flow"
+
+
+async def create_run(workflow_id):
+    response = await routes.create_workflow(workflow_id)
+    return orjson.loads(response.body)["run_id"]
+
+
+def live_engine(workflow_id, run_id):
+    return routes._live_engines[(workflow_id, run_id)][1]
+
+
+# Tests for live engine reuse
+async def test_step_reuses_live_engine(workflow_id):
+    """Test that consecutive steps of a run continue the same engine"""
+    run_id = await create_run(workflow_id)
+
+    await routes.step_workflow(workflow_id, run_id, None, None, False)
+    engine = live_engine(workflow_id, run_id)
+    response = await routes.step_workflow(workflow_id, run_id, None, None, False)
+
+    assert live_engine(workflow_id, run_id) is engine
+    steps = orjson.loads(response.body)["execution_data"]["steps"]
+    assert steps[-1]["shared"]["visited"] == ["a", "b"]
+
+
+async def test_workflow_file_change_rebuilds_engine(workflow_id):
+    """Test that editing the workflow JSON rebuilds the run's engine"""
+    run_id = await create_run(workflow_id)
+    await routes.step_workflow(workflow_id, run_id, None, None, False)
+    engine = live_engine(workflow_id, run_id)
+
+    stat = os.stat("flow.json")
+    os.utime("flow.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    await routes.step_workflow(workflow_id, run_id, None, None, False)
+
+    assert live_engine(workflow_id, run_id) is not engine
+
+
+async def test_node_reload_rebuilds_engine(workflow_id, monkeypatch):
+    """Test that a node module reload rebuilds the run's engine"""
+    run_id = await create_run(workflow_id)
+    await routes.step_workflow(workflow_id, run_id, None, None, False)
+    engine = live_engine(workflow_id, run_id)
+
+    monkeypatch.setattr(grapheteria, "_registry_version", grapheteria._registry_version + 1)
+    await routes.step_workflow(workflow_id, run_id, None, None, False)
+
+    assert live_engine(workflow_id, run_id) is not engine
+
+
+async def test_least_recently_used_engine_evicted(workflow_id, monkeypatch):
+    """Test that only MAX_LIVE_ENGINES engines are kept"""
+    monkeypatch.setattr(routes, "MAX_LIVE_ENGINES", 1)
+    first = await create_run(workflow_id)
+    await asyncio.sleep(0.002)  # Run ids are millisecond timestamps
+    second = await create_run(workflow_id)
+
+    await routes.step_workflow(workflow_id, first, None, None, False)
+    await routes.step_workflow(workflow_id, second, None, None, False)
+
+    assert list(routes._live_engines) == [(workflow_id, second)]
+
+
+async def test_finished_run_released(workflow_id):
+    """Test that a completed run's engine is dropped from the cache"""
+    run_id = await create_run(workflow_id)
+
+    await routes.run_workflow(workflow_id, run_id, None, None, False)
+
+    assert (workflow_id, run_id) not in routes._live_engines
+
+
+async def test_concurrent_steps_of_one_run_serialize(workflow_id):
+    """Test that simultaneous step requests for a run take turns on its engine"""
+    run_id = await create_run(workflow_id)
+
+    await asyncio.gather(
+        routes.step_workflow(workflow_id, run_id, None, None, False),
+        routes.step_workflow(workflow_id, run_id, None, None, False),
+    )
+
+    engine = live_engine(workflow_id, run_id)
+    assert engine.execution_state.shared["visited"] == ["a", "b"]
@@ -1,7 +1,7 @@
 import pytest
 import tempfile
 
-from grapheteria import Node, WorkflowEngine
+from grapheteria import Node, WorkflowEngine, ExecutionState, WorkflowStatus
 
 
 # Test Node implementations
@@ -295,4 +295,19 @@ class TestSharedDictionary:
         complex_data = workflow.tracking_data['steps'][-1]['shared']['complex_data']
         assert complex_data['top_level'] == "value"
         assert complex_data['level1']['level2']['level3'][2]['key'] == "value"
-        assert complex_data['level1']['another_key'][0]['nested'] == True
\ No newline at end of file
+        assert complex_data['level1']['another_key'][0]['nested'] == True
+
+    def test_snapshot_keeps_shared_references(self):
+        """Test that repeated and self-referencing containers survive a save round trip"""
+        items = [1, 2]
+        shared = {"a": items, "b": items}
+        shared["self"] = shared
+        state = ExecutionState(
+            shared=shared, next_node_id=None, workflow_status=WorkflowStatus.HEALTHY
+        )
+
+        restored = ExecutionState.from_dict(state.to_dict()).shared
+
+        assert restored["a"] is restored["b"]
+        assert restored["a"] is not items
+        assert restored["self"] is restored
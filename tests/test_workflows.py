@@ -4,10 +4,13 @@ import json
 import tempfile
 from unittest.mock import patch, MagicMock
 
+import grapheteria
+
 from grapheteria import (
     WorkflowEngine, Node, WorkflowStatus, NodeStatus, 
     StorageBackend
 )
+from grapheteria.utils import FileSystemStorage
 
 # Custom Node classes for testing
 class StartNode(Node):
@@ -37,6 +40,16 @@ class InputNode(Node):
         shared["user_name"] = execution_result["user_name"]
         return execution_result
 
+class TwoQuestionNode(Node):
+    async def prepare(self, shared, request_input):
+        name = await request_input("Name?", request_id="name")
+        city = await request_input("City?", request_id="city")
+        return {"name": name, "city": city}
+
+    def cleanup(self, shared, prepared_result, execution_result):
+        shared.update(prepared_result)
+        return execution_result
+
 class EndNode(Node):
     def execute(self, prepared_result):
         return {"message": "Completed"}
@@ -49,6 +62,20 @@ class FailingNode(Node):
     def execute(self, prepared_result):
         raise ValueError("This node intentionally fails")
 
+class CountingNode(Node):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.seen = []
+
+    def execute(self, prepared_result):
+        self.seen.append(prepared_result)
+        self.config["n"] = self.config.get("n", 0) + 1
+        return len(self.seen)
+
+    def cleanup(self, shared, prepared_result, execution_result):
+        shared["count"] = execution_result
+        shared["n"] = self.config["n"]
+
 
 # Test fixtures
 @pytest.fixture
@@ -123,6 +150,80 @@ class TestInitialization:
         assert engine.start_node_id == "start"
         assert engine.run_id is not None
         
+    @pytest.mark.asyncio
+    async def test_json_graph_reused_until_file_changes(self, workflow_json, tmp_path):
+        """Test that engines share the parsed graph until the JSON file changes."""
+        storage = FileSystemStorage(base_dir=str(tmp_path))
+        first = WorkflowEngine(workflow_path=workflow_json, storage_backend=storage)
+        second = WorkflowEngine(workflow_path=workflow_json, storage_backend=storage)
+
+        # Separate node instances and shared state, same edge objects
+        assert first.nodes["start"] is not second.nodes["start"]
+        assert first.nodes["start"].edges["process"] is second.nodes["start"].edges["process"]
+        first.execution_state.shared["counter"] = 5
+        assert second.execution_state.shared["counter"] == 0
+
+        with open(workflow_json) as f:
+            data = json.load(f)
+        data["edges"] = [{"from": "start", "to": "end"}]
+        with open(workflow_json, "w") as f:
+            json.dump(data, f)
+        stat = os.stat(workflow_json)
+        os.utime(workflow_json, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        third = WorkflowEngine(workflow_path=workflow_json, storage_backend=storage)
+        assert list(third.nodes["start"].edges) == ["end"]
+
+    @pytest.mark.asyncio
+    async def test_json_graph_cache_keeps_node_state_per_engine(self, tmp_path):
+        """Test that engines built from one cached graph don't share node or config state."""
+        workflow_path = str(tmp_path / "counting.json")
+        with open(workflow_path, "w") as f:
+            json.dump(
+                {"nodes": [{"id": "count", "class": "CountingNode", "config": {"n": 0}}]},
+                f,
+            )
+
+        for _ in range(3):
+            engine = WorkflowEngine(
+                workflow_path=workflow_path,
+                storage_backend=FileSystemStorage(base_dir=str(tmp_path)),
+            )
+            await engine.run()
+
+            assert engine.execution_state.shared["count"] == 1
+            assert engine.execution_state.shared["n"] == 1
+
+    @pytest.mark.asyncio
+    async def test_json_graph_cache_is_bounded(self, workflow_json, tmp_path):
+        """Test that the least recently used parsed graph is evicted when full."""
+        other_json = str(tmp_path / "other.json")
+        with open(workflow_json) as f:
+            data = f.read()
+        with open(other_json, "w") as f:
+            f.write(data)
+
+        storage = FileSystemStorage(base_dir=str(tmp_path))
+        with patch('grapheteria._WORKFLOW_CACHE_SIZE', 1):
+            WorkflowEngine(workflow_path=workflow_json, storage_backend=storage)
+            WorkflowEngine(workflow_path=other_json, storage_backend=storage)
+
+            cached_paths = [key[0] for key in grapheteria._WORKFLOW_CACHE]
+            assert cached_paths == [os.path.abspath(other_json)]
+
+    @pytest.mark.asyncio
+    async def test_unknown_node_types_reported_together(self, workflow_json):
+        """Test that every unknown node class is named in one error."""
+        with open(workflow_json) as f:
+            data = json.load(f)
+        data["nodes"][1]["class"] = "MissingNodeA"
+        data["nodes"][2]["class"] = "MissingNodeB"
+        with open(workflow_json, "w") as f:
+            json.dump(data, f)
+
+        with pytest.raises(ValueError, match="MissingNodeA, MissingNodeB"):
+            WorkflowEngine(workflow_path=workflow_json)
+
     @pytest.mark.asyncio
     async def test_init_with_workflow_id(self, workflow_json):
         """Test initializing with workflow_id instead of path."""
@@ -206,6 +307,8 @@ class TestRunIdAndResumption:
         assert engine.run_id == "test_run"
         assert engine.execution_state.next_node_id == "process"
         assert engine.execution_state.shared == {"start_executed": True}
+        # Resuming from the latest step has nothing to rewrite
+        mock_storage.save_state.assert_not_called()
         
     @pytest.mark.asyncio
     async def test_resume_non_existent_run(self, nodes):
@@ -317,6 +420,27 @@ class TestInputHandling:
         assert engine.execution_state.shared.get("user_name") == "Alice"
         assert engine.execution_state.awaiting_input is None
 
+    @pytest.mark.asyncio
+    async def test_one_step_answers_several_requests(self, tmp_path):
+        """Test that one step's input can satisfy consecutive input requests."""
+        start = StartNode(id="start")
+        questions = TwoQuestionNode(id="questions")
+        start > questions
+        engine = WorkflowEngine(
+            nodes=[start, questions],
+            storage_backend=FileSystemStorage(base_dir=str(tmp_path)),
+        )
+
+        await engine.run()
+        assert engine.execution_state.awaiting_input["request_id"] == "name"
+
+        await engine.step({"name": "Alice", "city": "Paris"})
+
+        assert engine.execution_state.awaiting_input is None
+        assert engine.execution_state.workflow_status == WorkflowStatus.COMPLETED
+        assert engine.execution_state.shared["name"] == "Alice"
+        assert engine.execution_state.shared["city"] == "Paris"
+
 
 # Tests for step and run functions
 class TestExecution: